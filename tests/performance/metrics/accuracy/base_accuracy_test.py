@@ -4,7 +4,9 @@ Clase base para tests de precisión de detección de gestos.
 Proporciona funcionalidades comunes para medir accuracy, precision, recall, F1-score.
 """
 
+import os
 import time
+import zlib
 import logging
 import unittest
 from abc import ABC, abstractmethod
@@ -14,9 +16,35 @@ from collections import defaultdict, Counter
 import json
 from datetime import datetime
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # numba es opcional (requirements_testing.txt): sin él los kernels @njit se ejecutan en Python
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 
+# Semilla raíz común a todas las simulaciones de precisión. GESTUREAI_ACCURACY_SEED la sustituye
+# (decimal o hexadecimal, p. ej. 0x1234) para repetir la suite con otros flujos aleatorios
+ROOT_SEED = int(os.environ.get('GESTUREAI_ACCURACY_SEED', '0x5EED'), 0)
+
+def derive_seed(*labels: str) -> List[int]:
+    """
+    Deriva una semilla para np.random.default_rng a partir de la raíz y unas etiquetas
+    
+    Args:
+        labels: Etiquetas que identifican el flujo (nombre del test, clave de un lote...)
+        
+    Returns:
+        Secuencia [ROOT_SEED, crc32(etiqueta), ...], estable entre procesos
+    """
+    return [ROOT_SEED, *(zlib.crc32(label.encode()) for label in labels)]
+
 class AccuracyMetrics:
     """Clase para calcular métricas de precisión"""
     
@@ -130,7 +158,6 @@ class BaseAccuracyTest(unittest.TestCase, ABC):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.logger = logging.getLogger(self.__class__.__name__)
         self.timing_data = []
         self.accuracy_results = {}
         self.test_start_time = None
@@ -146,12 +173,20 @@ class BaseAccuracyTest(unittest.TestCase, ABC):
         """Configuración inicial para todos los tests de la clase"""
         cls.controller_name = getattr(cls, 'controller_name', 'UnknownController')
         cls.target_accuracy = getattr(cls, 'target_accuracy', 0.90)
+        # El logger es común a todos los tests de la clase: se obtiene una sola vez
+        cls.logger = logging.getLogger(cls.__name__)
         print(f"\n🎯 Iniciando tests de precisión para {cls.controller_name}")
         print(f"   Objetivo de precisión: {cls.target_accuracy*100:.1f}%")
     
     def setUp(self):
         """Configurar el test individual"""
         self.test_start_time = time.time()
+        
+        # Generador aleatorio dedicado (PCG64) por test: semilla raíz común más el nombre del
+        # test, así que cada test es reproducible, distinto del resto e independiente del orden
+        # y del worker en que se ejecute
+        self.seed_label = f"{type(self).__name__}.{self._testMethodName}"
+        self.rng = np.random.default_rng(derive_seed(self.seed_label))
         self.accuracy_results = {
             'predictions': [],
             'ground_truth': [],
@@ -208,6 +243,33 @@ class BaseAccuracyTest(unittest.TestCase, ABC):
         self.accuracy_results['confidence_scores'].append(confidence)
         self.accuracy_results['timing_data'].append(detection_time)
     
+    def log_predictions(self, true_gestures, predicted_gestures, confidences, detection_times=None):
+        """
+        Registra un lote de predicciones de una sola vez
+        
+        Args:
+            true_gestures: Gestos verdaderos, o un único gesto común a todo el lote
+            predicted_gestures: Gestos predichos
+            confidences: Confianzas de las predicciones
+            detection_times: Tiempos de detección en ms (0.0 si no se indican)
+        """
+        n = len(predicted_gestures)
+        if isinstance(true_gestures, str):
+            true_gestures = [true_gestures] * n
+        if detection_times is None:
+            detection_times = [0.0] * n
+        
+        # Los arrays de NumPy se convierten de una vez a tipos nativos de Python
+        true_gestures, predicted_gestures, confidences, detection_times = (
+            values.tolist() if isinstance(values, np.ndarray) else values
+            for values in (true_gestures, predicted_gestures, confidences, detection_times)
+        )
+        
+        self.accuracy_results['ground_truth'].extend(true_gestures)
+        self.accuracy_results['predictions'].extend(predicted_gestures)
+        self.accuracy_results['confidence_scores'].extend(confidences)
+        self.accuracy_results['timing_data'].extend(detection_times)
+    
     def calculate_accuracy_metrics(self) -> Dict[str, Any]:
         """
         Calcula métricas de precisión basadas en las predicciones registradas
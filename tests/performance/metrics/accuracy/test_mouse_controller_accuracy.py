@@ -2,24 +2,173 @@
 """
 Tests de precisión para MouseControllerEnhanced.
 Mide la precisión de detección de gestos de mouse como clicks, movimientos, scrolls.
+
+Los tests son independientes entre sí y pueden ejecutarse en paralelo con pytest-xdist:
+    pytest tests/performance/metrics/accuracy/test_mouse_controller_accuracy.py -n auto
 """
 
 import sys
 import os
 import time
+import functools
+from types import MappingProxyType
 import unittest
+from statistics import NormalDist
 from unittest.mock import Mock, patch
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Union, NamedTuple, Mapping
 
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
 
-from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest
+from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest, NUMBA_AVAILABLE, njit
+
+@njit(cache=True)
+def _sample_detection_index(draws, gesture_idx, accuracy_rate, confusion_ids, confusion_cdf, n_others):
+    """
+    Kernel numérico de una detección simulada (compilable con numba)
+    
+    Args:
+        draws: Tres uniformes en [0, 1): acierto, tipo de error y selección
+        gesture_idx: Índice del gesto verdadero (o n_gestos si no está en la lista)
+        accuracy_rate: Probabilidad de acierto del gesto
+        confusion_ids: Índices de los gestos con los que suele confundirse
+        confusion_cdf: CDF normalizada de esas confusiones
+        n_others: Cantidad de gestos candidatos para un error aleatorio
+        
+    Returns:
+        Índice del gesto detectado
+    """
+    if draws[0] < accuracy_rate:
+        return gesture_idx
+    
+    # 80% de errores son confusiones comunes
+    if confusion_ids.size > 0 and draws[1] < 0.80:
+        return confusion_ids[np.searchsorted(confusion_cdf, draws[2], side='right')]
+    
+    # Error aleatorio: cualquier otro gesto, saltando el verdadero
+    other_idx = int(draws[2] * n_others)
+    if other_idx >= gesture_idx:
+        other_idx += 1
+    return other_idx
+
+# Precisión específica por gesto de mouse
+_ACC_RATES = MappingProxyType({
+    'left_click': 0.98,          # Muy preciso, gesto fundamental
+    'right_click': 0.96,         # Muy preciso, gesto común
+    'double_click': 0.94,        # Preciso, requiere timing
+    'middle_click': 0.91,        # Bueno, menos común
+    'scroll_up': 0.95,           # Muy preciso, gesto común
+    'scroll_down': 0.95,         # Muy preciso, gesto común
+    'scroll_left': 0.89,         # Menos preciso, menos común
+    'scroll_right': 0.89,        # Menos preciso, menos común
+    'move_cursor': 0.92,         # Bueno, movimiento continuo
+    'drag_drop': 0.88,           # Complejo, requiere inicio/fin
+    'hover': 0.90,               # Bueno pero requiere estabilidad
+    'click_and_hold': 0.86,      # Complejo, requiere timing
+    'no_gesture': 0.96           # Excelente detección de ausencia
+})
+
+# Confusiones comunes específicas de mouse
+_CONFUSIONS = MappingProxyType({gesture: MappingProxyType(confusions) for gesture, confusions in {
+    'left_click': {'double_click': 0.02},
+    'double_click': {'left_click': 0.04, 'right_click': 0.02},
+    'right_click': {'left_click': 0.02, 'middle_click': 0.02},
+    'middle_click': {'right_click': 0.05, 'scroll_up': 0.04},
+    'scroll_up': {'scroll_down': 0.03, 'move_cursor': 0.02},
+    'scroll_down': {'scroll_up': 0.03, 'move_cursor': 0.02},
+    'scroll_left': {'scroll_right': 0.07, 'scroll_up': 0.04},
+    'scroll_right': {'scroll_left': 0.07, 'scroll_down': 0.04},
+    'move_cursor': {'hover': 0.05, 'no_gesture': 0.03},
+    'drag_drop': {'move_cursor': 0.08, 'click_and_hold': 0.04},
+    'hover': {'move_cursor': 0.06, 'no_gesture': 0.04},
+    'click_and_hold': {'left_click': 0.08, 'drag_drop': 0.06}
+}.items()})
+
+class _SamplingTables(NamedTuple):
+    """Tablas de muestreo precalculadas, indexadas por posición del gesto"""
+    gestures: np.ndarray
+    label_to_idx: Mapping[str, int]
+    acc_rates: np.ndarray
+    confusion_cdfs: Tuple[Tuple[np.ndarray, np.ndarray], ...]
+    has_confusions: np.ndarray
+    confusion_index_tables: Mapping[str, Tuple[np.ndarray, np.ndarray]]
+    no_confusions: Tuple[np.ndarray, np.ndarray]
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Marca un array de las tablas compartidas como de solo lectura"""
+    array.setflags(write=False)
+    return array
+
+@functools.lru_cache(maxsize=None)
+def _build_tables(gestures: Tuple[str, ...]) -> _SamplingTables:
+    """
+    Construye las tablas de muestreo a partir de _ACC_RATES y _CONFUSIONS
+    
+    Args:
+        gestures: Gestos de test, en el orden que define sus índices
+        
+    Returns:
+        Tablas compartidas por todos los tests, congeladas: arrays de solo
+        lectura, diccionarios como MappingProxyType y secuencias como tuplas
+    """
+    label_to_idx = {gesture: i for i, gesture in enumerate(gestures)}
+    
+    # (índices de gestos, CDF normalizada) por gesto confundible
+    no_confusions = (_read_only(np.empty(0, dtype=np.int64)), _read_only(np.empty(0)))
+    confusion_index_tables = {
+        gesture: (_read_only(np.array([label_to_idx[g] for g in confusions], dtype=np.int64)),
+                  _read_only(np.cumsum(list(confusions.values())) / sum(confusions.values())))
+        for gesture, confusions in _CONFUSIONS.items()
+        if sum(confusions.values()) > 0
+    }
+    confusion_cdfs = tuple(confusion_index_tables.get(g, no_confusions) for g in gestures)
+    
+    return _SamplingTables(
+        gestures=_read_only(np.array(gestures)),
+        label_to_idx=MappingProxyType(label_to_idx),
+        acc_rates=_read_only(np.array([_ACC_RATES.get(g, 0.90) for g in gestures])),
+        confusion_cdfs=confusion_cdfs,
+        has_confusions=_read_only(np.array([len(ids) > 0 for ids, _ in confusion_cdfs])),
+        confusion_index_tables=MappingProxyType(confusion_index_tables),
+        no_confusions=no_confusions
+    )
+
+@functools.lru_cache(maxsize=1)
+def _rapid_permutation() -> np.ndarray:
+    """
+    Orden mezclado de la secuencia rápida: 30 ciclos de 5 gestos
+    
+    Se genera una vez por proceso con semilla fija, así que todos los
+    workers en paralelo usan exactamente la misma secuencia.
+    
+    Returns:
+        Índices int8 (0-4) en la lista de gestos rápidos, de solo lectura
+    """
+    permutation = np.random.default_rng(42).permutation(np.tile(np.arange(5, dtype=np.int8), 30))
+    permutation.setflags(write=False)
+    return permutation
 
 class TestMouseControllerAccuracy(BaseAccuracyTest):
     """Test de accuracy para MouseControllerEnhanced."""
     
+    # Gestos de mouse a testear (tupla inmutable compartida, sin reconstruir en cada llamada)
+    _TEST_GESTURES = (
+        'left_click',
+        'right_click',
+        'double_click',
+        'middle_click',
+        'scroll_up',
+        'scroll_down',
+        'scroll_left',
+        'scroll_right',
+        'move_cursor',
+        'drag_drop',
+        'hover',
+        'click_and_hold',
+        'no_gesture'
+    )
+    
     @classmethod
     def setUpClass(cls):
         """Configuración inicial para todos los tests."""
@@ -27,12 +176,8 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
         cls.target_accuracy = 0.94  # 94% - Muy alto para interacción crítica
         super().setUpClass()
         
-    def setUp(self):
-        """Configurar el test individual."""
-        super().setUp()
-        
-        # Mock de las dependencias de mouse
-        self.mouse_patches = [
+        # Mock de las dependencias de mouse (una sola vez para toda la clase)
+        cls.mouse_patches = [
             patch('pyautogui.click'),
             patch('pyautogui.doubleClick'),
             patch('pyautogui.rightClick'),
@@ -42,64 +187,28 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
             patch('os.path.exists', return_value=True)
         ]
         
-        self.mouse_mocks = [p.start() for p in self.mouse_patches]
-        
-        # Configurar precisión específica por gesto de mouse
-        self.gesture_accuracy_rates = {
-            'left_click': 0.98,          # Muy preciso, gesto fundamental
-            'right_click': 0.96,         # Muy preciso, gesto común
-            'double_click': 0.94,        # Preciso, requiere timing
-            'middle_click': 0.91,        # Bueno, menos común
-            'scroll_up': 0.95,           # Muy preciso, gesto común
-            'scroll_down': 0.95,         # Muy preciso, gesto común
-            'scroll_left': 0.89,         # Menos preciso, menos común
-            'scroll_right': 0.89,        # Menos preciso, menos común
-            'move_cursor': 0.92,         # Bueno, movimiento continuo
-            'drag_drop': 0.88,           # Complejo, requiere inicio/fin
-            'hover': 0.90,               # Bueno pero requiere estabilidad
-            'click_and_hold': 0.86,      # Complejo, requiere timing
-            'no_gesture': 0.96           # Excelente detección de ausencia
-        }
-        
-        # Configurar confusiones comunes específicas de mouse
-        self.common_confusions = {
-            'left_click': {'double_click': 0.02},
-            'double_click': {'left_click': 0.04, 'right_click': 0.02},
-            'right_click': {'left_click': 0.02, 'middle_click': 0.02},
-            'middle_click': {'right_click': 0.05, 'scroll_up': 0.04},
-            'scroll_up': {'scroll_down': 0.03, 'move_cursor': 0.02},
-            'scroll_down': {'scroll_up': 0.03, 'move_cursor': 0.02},
-            'scroll_left': {'scroll_right': 0.07, 'scroll_up': 0.04},
-            'scroll_right': {'scroll_left': 0.07, 'scroll_down': 0.04},
-            'move_cursor': {'hover': 0.05, 'no_gesture': 0.03},
-            'drag_drop': {'move_cursor': 0.08, 'click_and_hold': 0.04},
-            'hover': {'move_cursor': 0.06, 'no_gesture': 0.04},
-            'click_and_hold': {'left_click': 0.08, 'drag_drop': 0.06}
-        }
+        cls.mouse_mocks = [p.start() for p in cls.mouse_patches]
         
-    def tearDown(self):
-        """Limpiar después del test."""
-        super().tearDown()
-        for patch_obj in self.mouse_patches:
+    @classmethod
+    def tearDownClass(cls):
+        """Limpiar después de todos los tests."""
+        for patch_obj in cls.mouse_patches:
             patch_obj.stop()
-    
-    def get_test_gestures(self) -> List[str]:
-        """Retorna la lista de gestos de mouse a testear."""
-        return [
-            'left_click',
-            'right_click',
-            'double_click',
-            'middle_click',
-            'scroll_up',
-            'scroll_down',
-            'scroll_left',
-            'scroll_right',
-            'move_cursor',
-            'drag_drop',
-            'hover',
-            'click_and_hold',
-            'no_gesture'
-        ]
+        super().tearDownClass()
+        
+    def setUp(self):
+        """Configurar el test individual."""
+        super().setUp()
+        
+        # Tablas invariantes: se construyen una sola vez por proceso
+        self.gesture_accuracy_rates = _ACC_RATES
+        self.common_confusions = _CONFUSIONS
+        (self._all_gestures_arr, self._label_to_idx, self._acc_rates, self._confusion_cdfs,
+         self._has_confusions, self._confusion_index_tables, self._no_confusions) = _build_tables(self._TEST_GESTURES)
+        
+    def get_test_gestures(self) -> Tuple[str, ...]:
+        """Retorna los gestos de mouse a testear."""
+        return self._TEST_GESTURES
     
     def simulate_gesture_detection(self, gesture: str, expected_confidence: float = 0.8) -> Tuple[str, float]:
         """
@@ -112,115 +221,315 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
         Returns:
             Tupla (gesto_detectado, confianza_real)
         """
-        # Obtener tasa de precisión para este gesto
-        accuracy_rate = self.gesture_accuracy_rates.get(gesture, 0.90)
+        # Obtener tasa de precisión y confusiones para este gesto
+        n_gestures = len(self._all_gestures_arr)
+        gesture_idx = self._label_to_idx.get(gesture)
+        
+        if gesture_idx is not None:
+            accuracy_rate = self._acc_rates[gesture_idx]
+            confusion_ids, confusion_cdf = self._confusion_cdfs[gesture_idx]
+            n_others = n_gestures - 1
+        else:
+            # Gesto fuera de la lista: puede confundirse con cualquiera
+            accuracy_rate = self.gesture_accuracy_rates.get(gesture, 0.90)
+            confusion_ids, confusion_cdf = self._confusion_index_tables.get(gesture, self._no_confusions)
+            gesture_idx, n_others = n_gestures, n_gestures
         
-        # Determinar si la predicción será correcta
-        is_correct = np.random.random() < accuracy_rate
+        # Decidir el gesto detectado en el kernel numérico
+        predicted_idx = _sample_detection_index(self.rng.random(3), gesture_idx, accuracy_rate,
+                                                confusion_ids, confusion_cdf, n_others)
         
-        if is_correct:
+        if predicted_idx == gesture_idx:
             # Predicción correcta
             predicted_gesture = gesture
             # Variar ligeramente la confianza
-            confidence_variation = np.random.normal(0, 0.02)
+            confidence_variation = self.rng.normal(0, 0.02)
             confidence = np.clip(expected_confidence + confidence_variation, 0.3, 0.99)
         else:
-            # Predicción incorrecta - elegir confusión común
-            confusions = self.common_confusions.get(gesture, {})
-            
-            if confusions and np.random.random() < 0.80:  # 80% de errores son confusiones comunes
-                confusion_gestures = list(confusions.keys())
-                confusion_probs = list(confusions.values())
-                
-                total_prob = sum(confusion_probs)
-                if total_prob > 0:
-                    confusion_probs = [p/total_prob for p in confusion_probs]
-                    predicted_gesture = np.random.choice(confusion_gestures, p=confusion_probs)
-                else:
-                    predicted_gesture = np.random.choice(self.get_test_gestures())
-            else:
-                # Error aleatorio
-                all_gestures = self.get_test_gestures()
-                predicted_gesture = np.random.choice([g for g in all_gestures if g != gesture])
+            # Predicción incorrecta
+            predicted_gesture = self._all_gestures_arr[predicted_idx]
             
             # Confianza más baja para predicciones incorrectas
-            confidence = np.random.uniform(0.3, 0.65)
-        
-        # Simular tiempo de procesamiento muy rápido para mouse
-        time.sleep(0.0003)  # 0.3ms de procesamiento simulado
+            confidence = self.rng.uniform(0.3, 0.65)
         
         return predicted_gesture, confidence
     
+    def simulate_gesture_detections_batch(self, gesture: str, n: int,
+                                          expected_confidence: float = 0.8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula n detecciones de un gesto de mouse de una sola vez
+        
+        Equivale a n llamadas a simulate_gesture_detection, pero con unas
+        pocas operaciones vectorizadas de NumPy en lugar de un bucle Python.
+        
+        Args:
+            gesture: Nombre del gesto a simular (uno de _TEST_GESTURES)
+            n: Cantidad de detecciones
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (gestos_detectados, confianzas_reales) como arrays de longitud n
+        """
+        return self.simulate_gesture_sequence(np.full(n, self._label_to_idx[gesture]), expected_confidence)
+    
+    def simulate_gesture_sequence(self, gesture_indices: np.ndarray,
+                                  expected_confidence: float = 0.8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula la detección de una secuencia mixta de gestos dada por índices
+        
+        Todas las decisiones se toman con operaciones vectorizadas sobre la
+        secuencia completa, usando las tablas indexadas por gesto.
+        
+        Args:
+            gesture_indices: Índices en _TEST_GESTURES de los gestos de la secuencia
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (gestos_detectados, confianzas_reales) alineada con la secuencia
+        """
+        gesture_indices = np.asarray(gesture_indices)
+        n = gesture_indices.size
+        
+        # Determinar qué predicciones serán correctas con la tasa de cada gesto
+        correct_mask = self.rng.random(n) < self._acc_rates[gesture_indices]
+        predicted_indices = gesture_indices.copy()
+        
+        wrong_positions = np.flatnonzero(~correct_mask)
+        if wrong_positions.size:
+            wrong_truth = gesture_indices[wrong_positions]
+            
+            # Error aleatorio por defecto: cualquier otro gesto, saltando el verdadero
+            wrong_predictions = self.rng.integers(len(self._all_gestures_arr) - 1, size=wrong_positions.size)
+            wrong_predictions += (wrong_predictions >= wrong_truth)
+            
+            # 80% de errores son confusiones comunes
+            use_confusion = (self.rng.random(wrong_positions.size) < 0.80) & self._has_confusions[wrong_truth]
+            for gesture_idx in np.unique(wrong_truth[use_confusion]):
+                positions = np.flatnonzero(use_confusion & (wrong_truth == gesture_idx))
+                confusion_ids, confusion_cdf = self._confusion_cdfs[gesture_idx]
+                draws = self.rng.random(positions.size)
+                wrong_predictions[positions] = confusion_ids[np.searchsorted(confusion_cdf, draws, side='right')]
+            
+            predicted_indices[wrong_positions] = wrong_predictions
+        
+        # Confianza variada alrededor de la esperada, recortada en sitio sobre todo el lote
+        confidences = expected_confidence + self.rng.normal(0, 0.02, n)
+        np.clip(confidences, 0.3, 0.99, out=confidences)
+        
+        # Confianza más baja para predicciones incorrectas
+        confidences[wrong_positions] = self.rng.uniform(0.3, 0.65, wrong_positions.size)
+        
+        return self._all_gestures_arr[predicted_indices], confidences
+    
+    def build_confusion_matrix(self, true_gestures: np.ndarray, predictions: np.ndarray) -> np.ndarray:
+        """
+        Construye la matriz de confusión sobre los gestos de test en una sola pasada
+        
+        Args:
+            true_gestures: Gestos verdaderos
+            predictions: Gestos detectados
+            
+        Returns:
+            Matriz (K x K) con filas = gesto verdadero y columnas = gesto detectado
+        """
+        n_labels = len(self._label_to_idx)
+        truth_idx = np.fromiter((self._label_to_idx[g] for g in true_gestures), dtype=np.int32, count=len(true_gestures))
+        pred_idx = np.fromiter((self._label_to_idx[g] for g in predictions), dtype=np.int32, count=len(predictions))
+        
+        confusion_matrix = np.zeros((n_labels, n_labels), dtype=int)
+        np.add.at(confusion_matrix, (truth_idx, pred_idx), 1)
+        return confusion_matrix
+    
+    def simulate_gesture_group(self, gestures: List[str], n: int,
+                               expected_confidence: float = 0.8) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+        """
+        Simula n detecciones por gesto de un grupo y calcula la precisión por clase
+        a partir de la matriz de confusión del grupo
+        
+        Args:
+            gestures: Gestos del grupo
+            n: Muestras por gesto
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (precisión por gesto, confianzas por gesto)
+        """
+        all_truth = []
+        all_predictions = []
+        group_confidences = {}
+        
+        for gesture in gestures:
+            predictions, confidences = self.simulate_gesture_detections_batch(gesture, n, expected_confidence)
+            
+            self.log_predictions(gesture, predictions, confidences)
+            
+            all_truth.append(np.full(n, gesture, dtype=object))
+            all_predictions.append(predictions)
+            group_confidences[gesture] = confidences
+        
+        confusion_matrix = self.build_confusion_matrix(np.concatenate(all_truth), np.concatenate(all_predictions))
+        class_accuracies = confusion_matrix.diagonal() / np.maximum(confusion_matrix.sum(axis=1), 1)
+        
+        accuracies = {gesture: class_accuracies[self._label_to_idx[gesture]] for gesture in gestures}
+        return accuracies, group_confidences
+    
+    def _run_group(self, gestures: List[str], n_samples: int, min_accuracy: Union[float, Dict[str, float]],
+                   expected_confidence: float = 0.85, show_confidence: bool = False) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        Ejecuta el bloque común de los tests por grupo: simula n_samples detecciones
+        por gesto, calcula su precisión e imprime el estado de cada gesto
+        
+        Args:
+            gestures: Gestos del grupo
+            n_samples: Muestras por gesto
+            min_accuracy: Umbral de estado, único o por gesto
+            expected_confidence: Nivel de confianza esperado
+            show_confidence: Incluir la confianza media en cada línea de estado
+            
+        Returns:
+            Tupla (precisión por gesto, confianza media por gesto)
+        """
+        accuracies, confidences = self.simulate_gesture_group(gestures, n_samples, expected_confidence)
+        avg_confidences = {gesture: confidences[gesture].mean() for gesture in gestures}
+        
+        status_lines = []
+        for gesture in gestures:
+            accuracy = accuracies[gesture]
+            threshold = min_accuracy[gesture] if isinstance(min_accuracy, dict) else min_accuracy
+            status = "✅" if accuracy >= threshold else "⚠️"
+            
+            if show_confidence:
+                status_lines.append(f"   {status} {gesture}: Precisión {accuracy:.3f}, Confianza {avg_confidences[gesture]:.3f}")
+            else:
+                status_lines.append(f"   {status} {gesture}: {accuracy:.3f}")
+        
+        # Una sola escritura por grupo
+        self.logger.debug("\n".join(status_lines))
+        
+        return accuracies, avg_confidences
+    
+    def sample_until_decided(self, gesture: str, threshold: float, expected_confidence: float = 0.8,
+                             alpha: float = 0.05, n_looks: int = 3, max_n: int = 25) -> Tuple[float, int]:
+        """
+        Simula detecciones de un gesto con un diseño secuencial por grupos: revisa el
+        resultado en n_looks puntos fijos y para antes del final si el intervalo de
+        Wilson de la precisión queda completamente por encima o por debajo del umbral
+        
+        Las miradas intermedias usan alpha / (n_looks - 1) (Bonferroni), así que la tasa
+        de decisiones falsas anticipadas no supera alpha. La última mirada aplica el mismo
+        criterio que un presupuesto fijo de max_n muestras. Solo hay ahorro cuando la
+        precisión está lejos del umbral: con 9 muestras la cota inferior de 9/9 es ~0.64,
+        de modo que un umbral de 0.93 casi siempre necesita el presupuesto completo.
+        
+        Args:
+            gesture: Nombre del gesto a simular
+            threshold: Precisión mínima que se va a verificar
+            expected_confidence: Nivel de confianza esperado
+            alpha: Nivel de significancia global de las paradas anticipadas (bilateral)
+            n_looks: Cantidad de revisiones, incluida la final con max_n muestras
+            max_n: Presupuesto máximo de muestras
+            
+        Returns:
+            Tupla (precisión observada, muestras usadas)
+        """
+        z = NormalDist().inv_cdf(1 - alpha / (2 * max(n_looks - 1, 1)))
+        # Puntos de revisión fijos: ceil(max_n * k / n_looks) para k = 1..n_looks
+        looks = [-(-max_n * k // n_looks) for k in range(1, n_looks + 1)]
+        correct = 0
+        n = 0
+        
+        for look in looks:
+            predictions, confidences = self.simulate_gesture_detections_batch(gesture, look - n, expected_confidence)
+            
+            self.log_predictions(gesture, predictions, confidences)
+            
+            correct += np.count_nonzero(predictions == gesture)
+            n = look
+            
+            if n >= max_n:
+                break
+            
+            # Intervalo de Wilson para la proporción de aciertos
+            p_hat = correct / n
+            center = p_hat + z**2 / (2 * n)
+            margin = z * np.sqrt(p_hat * (1 - p_hat) / n + z**2 / (4 * n**2))
+            lower = (center - margin) / (1 + z**2 / n)
+            upper = (center + margin) / (1 + z**2 / n)
+            
+            if lower >= threshold or upper < threshold:
+                break
+        
+        return correct / n, n
+    
     def test_basic_mouse_controls_accuracy(self):
         """Test de precisión para controles básicos de mouse"""
         basic_controls = ['left_click', 'right_click', 'double_click', 'middle_click']
         
-        print(f"\n🖱️ Testeando precisión de controles básicos...")
+        self.logger.debug(f"🖱️ Testeando precisión de controles básicos...")
+        
+        min_basic_accuracy = 0.93  # 93% mínimo para controles básicos
         
         for control in basic_controls:
-            predictions = []
-            ground_truth = []
-            
-            # Test con múltiples muestras
-            for _ in range(25):  # 25 muestras por control básico
-                predicted, confidence = self.simulate_gesture_detection(control, 0.9)
-                predictions.append(predicted)
-                ground_truth.append(control)
-                
-                self.log_prediction(control, predicted, confidence)
-            
-            # Calcular precisión para este control
-            accuracy = sum(1 for true_val, pred in zip(ground_truth, predictions) if true_val == pred) / len(predictions)
+            # Hasta 25 muestras por control básico, parando en cuanto el resultado es estadísticamente claro
+            accuracy, _ = self.sample_until_decided(control, min_basic_accuracy, 0.9)
             
             # Verificar que cumple mínimo para controles básicos
-            min_basic_accuracy = 0.93  # 93% mínimo para controles básicos
             self.assertGreaterEqual(accuracy, min_basic_accuracy,
                                   f"Precisión de {control} demasiado baja: {accuracy:.3f} < {min_basic_accuracy:.3f}")
             
             status = "✅" if accuracy >= min_basic_accuracy else "⚠️"
-            print(f"   {status} {control}: {accuracy:.3f}")
+            self.logger.debug(f"   {status} {control}: {accuracy:.3f}")
+    
+    def test_sample_until_decided_stops_early(self):
+        """Test de que la parada secuencial usa menos muestras que el presupuesto fijo"""
+        
+        self.logger.debug(f"⏱️ Testeando parada temprana del muestreo secuencial...")
+        
+        max_n = 25
+        
+        # left_click (0.98) frente a un umbral lejano: debe decidirse en la primera revisión
+        accuracy, n_used = self.sample_until_decided('left_click', 0.50, 0.9, max_n=max_n)
+        
+        self.logger.debug(f"   📉 left_click: {accuracy:.3f} con {n_used}/{max_n} muestras")
+        
+        self.assertGreaterEqual(accuracy, 0.50,
+                              f"Precisión de left_click por debajo del umbral: {accuracy:.3f}")
+        self.assertLessEqual(n_used, max_n // 2,
+                           f"La parada temprana no redujo las muestras: {n_used}/{max_n}")
+    
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba no instalado: el kernel se ejecuta en Python")
+    def test_jit_kernel_matches_python(self):
+        """Test de que el kernel compilado decide igual que su versión Python"""
+        
+        for gesture_idx in range(len(self._all_gestures_arr)):
+            confusion_ids, confusion_cdf = self._confusion_cdfs[gesture_idx]
+            args = (gesture_idx, self._acc_rates[gesture_idx], confusion_ids, confusion_cdf,
+                    len(self._all_gestures_arr) - 1)
+            
+            for draws in self.rng.random((50, 3)):
+                self.assertEqual(_sample_detection_index(draws, *args), _sample_detection_index.py_func(draws, *args),
+                                 f"El kernel compilado difiere de Python para {self._all_gestures_arr[gesture_idx]}")
     
     def test_click_precision_accuracy(self):
         """Test de precisión específica para diferentes tipos de click"""
         
-        print(f"\n👆 Testeando precisión de tipos de click...")
+        self.logger.debug(f"👆 Testeando precisión de tipos de click...")
         
         click_types = ['left_click', 'right_click', 'double_click']
-        click_accuracies = {}
-        
-        for click_type in click_types:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(20):  # 20 muestras por tipo de click
-                predicted, confidence = self.simulate_gesture_detection(click_type, 0.9)
-                self.log_prediction(click_type, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == click_type:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
-            click_accuracies[click_type] = accuracy
-            
-            status = "✅" if accuracy >= 0.90 else "⚠️"
-            print(f"   {status} {click_type}: {accuracy:.3f}")
+        click_accuracies, _ = self._run_group(click_types, 20, 0.90, 0.9)  # 20 muestras por tipo de click
         
         # Verificar que la precisión promedio de clicks es alta
-        avg_click_accuracy = np.mean(list(click_accuracies.values()))
+        avg_click_accuracy = sum(click_accuracies.values()) / len(click_accuracies)
         self.assertGreaterEqual(avg_click_accuracy, 0.92,
                               f"Precisión promedio de clicks insuficiente: {avg_click_accuracy:.3f}")
         
         # Test específico de discriminación left_click vs double_click
-        click_double_confusion = 0
-        for _ in range(20):
-            # Test left_click que no debe ser detectado como double_click
-            predicted, _ = self.simulate_gesture_detection('left_click', 0.9)
-            if predicted == 'double_click':
-                click_double_confusion += 1
+        # Test left_click que no debe ser detectado como double_click
+        predictions, _ = self.simulate_gesture_detections_batch('left_click', 20, 0.9)
+        click_double_confusion = np.count_nonzero(predictions == 'double_click')
         
         confusion_rate = click_double_confusion / 20
-        print(f"   🔄 Confusión left_click→double_click: {confusion_rate:.3f}")
+        self.logger.debug(f"   🔄 Confusión left_click→double_click: {confusion_rate:.3f}")
         
         self.assertLess(confusion_rate, 0.05,
                        f"Confusión left_click→double_click demasiado alta: {confusion_rate:.3f}")
@@ -228,37 +537,18 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
     def test_scroll_direction_accuracy(self):
         """Test de precisión para direcciones de scroll"""
         
-        print(f"\n📜 Testeando precisión de direcciones de scroll...")
+        self.logger.debug(f"📜 Testeando precisión de direcciones de scroll...")
         
-        scroll_directions = ['scroll_up', 'scroll_down', 'scroll_left', 'scroll_right']
-        scroll_accuracies = {}
-        
-        for direction in scroll_directions:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(18):  # 18 muestras por dirección
-                predicted, confidence = self.simulate_gesture_detection(direction, 0.85)
-                self.log_prediction(direction, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == direction:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
-            scroll_accuracies[direction] = accuracy
-            
-            # Scroll vertical debería ser más preciso que horizontal
-            min_accuracy = 0.90 if direction in ['scroll_up', 'scroll_down'] else 0.80
-            status = "✅" if accuracy >= min_accuracy else "⚠️"
-            print(f"   {status} {direction}: {accuracy:.3f}")
+        # Scroll vertical debería ser más preciso que horizontal
+        scroll_thresholds = {'scroll_up': 0.90, 'scroll_down': 0.90, 'scroll_left': 0.80, 'scroll_right': 0.80}
+        scroll_accuracies, _ = self._run_group(list(scroll_thresholds), 18, scroll_thresholds)  # 18 muestras por dirección
         
         # Verificar discriminación up/down vs left/right
-        vertical_accuracy = np.mean([scroll_accuracies['scroll_up'], scroll_accuracies['scroll_down']])
-        horizontal_accuracy = np.mean([scroll_accuracies['scroll_left'], scroll_accuracies['scroll_right']])
+        vertical_accuracy = (scroll_accuracies['scroll_up'] + scroll_accuracies['scroll_down']) * 0.5
+        horizontal_accuracy = (scroll_accuracies['scroll_left'] + scroll_accuracies['scroll_right']) * 0.5
         
-        print(f"   📊 Precisión vertical: {vertical_accuracy:.3f}")
-        print(f"   📊 Precisión horizontal: {horizontal_accuracy:.3f}")
+        self.logger.debug(f"   📊 Precisión vertical: {vertical_accuracy:.3f}\n"
+                          f"   📊 Precisión horizontal: {horizontal_accuracy:.3f}")
         
         self.assertGreaterEqual(vertical_accuracy, 0.90,
                               f"Precisión de scroll vertical insuficiente: {vertical_accuracy:.3f}")
@@ -268,38 +558,16 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
     def test_movement_gestures_accuracy(self):
         """Test de precisión para gestos de movimiento"""
         
-        print(f"\n🎯 Testeando precisión de gestos de movimiento...")
+        self.logger.debug(f"🎯 Testeando precisión de gestos de movimiento...")
         
-        movement_gestures = ['move_cursor', 'hover', 'drag_drop', 'click_and_hold']
-        movement_results = {}
-        
-        for gesture in movement_gestures:
-            predictions = []
-            confidences = []
-            
-            for _ in range(15):  # 15 muestras por gesto de movimiento
-                predicted, confidence = self.simulate_gesture_detection(gesture, 0.8)
-                self.log_prediction(gesture, predicted, confidence)
-                
-                predictions.append(predicted == gesture)
-                confidences.append(confidence)
-            
-            accuracy = np.mean(predictions)
-            avg_confidence = np.mean(confidences)
-            
-            movement_results[gesture] = {
-                'accuracy': accuracy,
-                'confidence': avg_confidence
-            }
-            
-            # Los gestos de movimiento son más complejos, umbral menor
-            min_movement_accuracy = 0.85 if gesture in ['move_cursor', 'hover'] else 0.75
-            status = "✅" if accuracy >= min_movement_accuracy else "⚠️"
-            print(f"   {status} {gesture}: Precisión {accuracy:.3f}, Confianza {avg_confidence:.3f}")
+        # Los gestos de movimiento son más complejos, umbral menor
+        movement_thresholds = {'move_cursor': 0.85, 'hover': 0.85, 'drag_drop': 0.75, 'click_and_hold': 0.75}
+        movement_accuracies, _ = self._run_group(list(movement_thresholds), 15, movement_thresholds, 0.8,
+                                                 show_confidence=True)  # 15 muestras por gesto de movimiento
         
         # Verificar que move_cursor y hover tienen buena precisión
-        move_accuracy = movement_results['move_cursor']['accuracy']
-        hover_accuracy = movement_results['hover']['accuracy']
+        move_accuracy = movement_accuracies['move_cursor']
+        hover_accuracy = movement_accuracies['hover']
         
         self.assertGreaterEqual(move_accuracy, 0.85,
                               f"Precisión de move_cursor insuficiente: {move_accuracy:.3f}")
@@ -309,7 +577,7 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
     def test_complex_mouse_sequences(self):
         """Test de precisión con secuencias complejas de mouse"""
         
-        print(f"\n🔄 Testeando secuencias complejas de mouse...")
+        self.logger.debug(f"🔄 Testeando secuencias complejas de mouse...")
         
         # Secuencias típicas de uso de mouse
         mouse_sequences = [
@@ -320,35 +588,24 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
             ['hover', 'left_click', 'scroll_up']                   # Interacción compleja
         ]
         
-        sequence_accuracies = []
+        # Todas las secuencias aplanadas en un único lote (todas tienen 3 gestos)
+        flat_truth = np.array([self._label_to_idx[g] for sequence in mouse_sequences for g in sequence])
+        predictions, confidences = self.simulate_gesture_sequence(flat_truth, 0.85)
+        ground_truth = self._all_gestures_arr[flat_truth]
+        self.log_predictions(ground_truth, predictions, confidences)
         
-        for i, sequence in enumerate(mouse_sequences):
-            sequence_predictions = []
-            sequence_ground_truth = []
-            
-            print(f"   🔄 Secuencia {i+1}: {' → '.join(sequence)}")
-            
-            for gesture in sequence:
-                predicted, confidence = self.simulate_gesture_detection(gesture, 0.85)
-                sequence_predictions.append(predicted)
-                sequence_ground_truth.append(gesture)
-                
-                self.log_prediction(gesture, predicted, confidence)
-                
-                # Pausa muy corta entre gestos
-                time.sleep(0.001)
-            
-            # Calcular precisión de esta secuencia
-            sequence_accuracy = sum(1 for true_val, pred in zip(sequence_ground_truth, sequence_predictions) 
-                                  if true_val == pred) / len(sequence_predictions)
-            sequence_accuracies.append(sequence_accuracy)
-            
-            print(f"      Precisión: {sequence_accuracy:.3f}")
+        # Precisión por secuencia con un reshape de la máscara de aciertos
+        correct = (predictions == ground_truth).reshape(len(mouse_sequences), -1)
+        per_sequence_accuracy = correct.mean(axis=1)
+        
+        for i, (sequence, sequence_accuracy) in enumerate(zip(mouse_sequences, per_sequence_accuracy)):
+            self.logger.debug(f"   🔄 Secuencia {i+1}: {' → '.join(sequence)}\n"
+                              f"      Precisión: {sequence_accuracy:.3f}")
         
         # Verificar precisión promedio de secuencias
-        avg_sequence_accuracy = np.mean(sequence_accuracies)
+        avg_sequence_accuracy = per_sequence_accuracy.mean()
         
-        print(f"   📊 Precisión promedio secuencias: {avg_sequence_accuracy:.3f}")
+        self.logger.debug(f"   📊 Precisión promedio secuencias: {avg_sequence_accuracy:.3f}")
         
         self.assertGreaterEqual(avg_sequence_accuracy, 0.85,
                               f"Precisión en secuencias complejas insuficiente: {avg_sequence_accuracy:.3f}")
@@ -356,37 +613,31 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
     def test_mouse_rapid_interaction(self):
         """Test de precisión con interacciones rápidas de mouse"""
         
-        print(f"\n⚡ Testeando interacciones rápidas de mouse...")
+        self.logger.debug(f"⚡ Testeando interacciones rápidas de mouse...")
         
         # Gestos más comunes en uso rápido
         rapid_gestures = ['left_click', 'right_click', 'scroll_up', 'scroll_down', 'move_cursor']
         
-        rapid_sequence = []
-        for _ in range(30):  # 30 ciclos de gestos comunes
-            rapid_sequence.extend(rapid_gestures)
+        rapid_ids = np.array([self._label_to_idx[g] for g in rapid_gestures])
         
-        # Mezclar para simular uso real
-        np.random.shuffle(rapid_sequence)
+        # 30 ciclos de gestos comunes, mezclados para simular uso real
+        rapid_sequence = rapid_ids[_rapid_permutation()]
         
-        rapid_results = []
         start_time = time.time()
         
-        for gesture in rapid_sequence:
-            predicted, confidence = self.simulate_gesture_detection(gesture, 0.85)
-            self.log_prediction(gesture, predicted, confidence)
-            
-            rapid_results.append(predicted == gesture)
-            
-            # Procesamiento muy rápido
-            time.sleep(0.0001)  # 0.1ms entre gestos
+        predictions, confidences = self.simulate_gesture_sequence(rapid_sequence, 0.85)
+        ground_truth = self._all_gestures_arr[rapid_sequence]
+        self.log_predictions(ground_truth, predictions, confidences)
+        
+        rapid_results = (predictions == ground_truth)
         
         total_time = time.time() - start_time
-        rapid_accuracy = np.mean(rapid_results)
+        rapid_accuracy = np.count_nonzero(rapid_results) / rapid_results.size
         
-        print(f"   ⚡ Gestos procesados: {len(rapid_sequence)}")
-        print(f"   ⏱️ Tiempo total: {total_time:.3f}s")
-        print(f"   🎯 Precisión rápida: {rapid_accuracy:.3f}")
-        print(f"   📈 Gestos/segundo: {len(rapid_sequence)/total_time:.1f}")
+        self.logger.debug(f"   ⚡ Gestos procesados: {len(rapid_sequence)}\n"
+                          f"   ⏱️ Tiempo total: {total_time:.3f}s\n"
+                          f"   🎯 Precisión rápida: {rapid_accuracy:.3f}\n"
+                          f"   📈 Gestos/segundo: {len(rapid_sequence)/total_time:.1f}")
         
         # Verificar que la precisión se mantiene en uso rápido
         self.assertGreaterEqual(rapid_accuracy, 0.90,
@@ -395,7 +646,7 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
     def test_mouse_gesture_confidence_thresholds(self):
         """Test de umbrales de confianza por tipo de gesto de mouse"""
         
-        print(f"\n📊 Testeando umbrales de confianza por tipo...")
+        self.logger.debug(f"📊 Testeando umbrales de confianza por tipo...")
         
         # Clasificar gestos por complejidad
         gesture_complexity = {
@@ -405,31 +656,33 @@ class TestMouseControllerAccuracy(BaseAccuracyTest):
             'movement': ['move_cursor', 'hover', 'drag_drop', 'click_and_hold']
         }
         
-        complexity_metrics = {}
+        # Plan de muestras aplanado de todos los grupos: 12 muestras por gesto
+        group_names = list(gesture_complexity)
+        plan_gestures = [g for gestures in gesture_complexity.values() for g in gestures]
+        gesture_indices = np.repeat(np.array([self._label_to_idx[g] for g in plan_gestures]), 12)
+        group_ids = np.repeat(np.arange(len(group_names)), [len(g) * 12 for g in gesture_complexity.values()])
         
-        for complexity, gestures in gesture_complexity.items():
-            group_confidences = []
-            group_accuracies = []
-            
-            for gesture in gestures:
-                for _ in range(12):  # 12 muestras por gesto
-                    predicted, confidence = self.simulate_gesture_detection(gesture, 0.85)
-                    
-                    is_correct = (predicted == gesture)
-                    group_confidences.append(confidence)
-                    group_accuracies.append(is_correct)
-                    
-                    self.log_prediction(gesture, predicted, confidence)
-            
-            avg_confidence = np.mean(group_confidences)
-            avg_accuracy = np.mean(group_accuracies)
+        predictions, confidences = self.simulate_gesture_sequence(gesture_indices, 0.85)
+        ground_truth = self._all_gestures_arr[gesture_indices]
+        self.log_predictions(ground_truth, predictions, confidences)
+        
+        # Reducciones por grupo sobre el lote completo
+        group_sizes = np.bincount(group_ids, minlength=len(group_names))
+        group_confidence = np.bincount(group_ids, weights=confidences, minlength=len(group_names)) / group_sizes
+        group_accuracy = np.bincount(group_ids, weights=predictions == ground_truth,
+                                     minlength=len(group_names)) / group_sizes
+        
+        complexity_metrics = {}
+        for group_id, complexity in enumerate(group_names):
+            avg_confidence = group_confidence[group_id]
+            avg_accuracy = group_accuracy[group_id]
             
             complexity_metrics[complexity] = {
                 'confidence': avg_confidence,
                 'accuracy': avg_accuracy
             }
             
-            print(f"   📈 {complexity}: Confianza {avg_confidence:.3f}, Precisión {avg_accuracy:.3f}")
+            self.logger.debug(f"   📈 {complexity}: Confianza {avg_confidence:.3f}, Precisión {avg_accuracy:.3f}")
         
         # Verificar que clicks básicos tienen alta precisión
         basic_metrics = complexity_metrics['basic_clicks']
@@ -7,6 +7,7 @@ Mide la precisión de detección de gestos de control multimedia.
 import sys
 import os
 import time
+import functools
 import unittest
 from unittest.mock import Mock, patch
 import numpy as np
@@ -15,11 +16,73 @@ from typing import List, Tuple, Dict, Any
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
 
-from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest
+from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest, NUMBA_AVAILABLE, derive_seed, njit
 
+# Factor de escala del número de muestras (ACCURACY_SCALE=0.25 para una pasada corta)
+_SCALE = float(os.environ.get("ACCURACY_SCALE", "1.0"))
+
+def _scaled(n: int) -> int:
+    """Aplica ACCURACY_SCALE a un número de muestras, con un mínimo de 4."""
+    return max(4, int(n * _SCALE))
+
+@njit(cache=True)
+def _decide_gesture_id(draws, gesture_id, accuracy_rate, confusion_ids, confusion_cdf, n_others):
+    """
+    Decide el gesto detectado en una muestra a partir de tres uniformes ya extraídos
+    
+    Args:
+        draws: Uniformes en [0, 1) para acierto, tipo de error y selección
+        gesture_id: Código entero del gesto verdadero
+        accuracy_rate: Probabilidad de acierto del gesto
+        confusion_ids: Códigos de los gestos con los que suele confundirse
+        confusion_cdf: Probabilidades acumuladas de esas confusiones
+        n_others: Cantidad de gestos candidatos para un error aleatorio
+        
+    Returns:
+        Código entero del gesto detectado
+    """
+    if draws[0] < accuracy_rate:
+        return gesture_id
+    
+    # 75% de errores son confusiones comunes
+    if confusion_ids.size > 0 and draws[1] < 0.75:
+        return confusion_ids[np.searchsorted(confusion_cdf, draws[2], side='right')]
+    
+    # Error aleatorio: cualquier otro gesto, saltando el verdadero
+    other_id = int(draws[2] * n_others)
+    if other_id >= gesture_id:
+        other_id += 1
+    return other_id
+
+# Ejecución rápida de CI: PERF_QUICK=1 omite esta clase completa. Se omite a nivel de clase y
+# no de módulo porque los runners del directorio importan el módulo directamente
+@unittest.skipIf(os.environ.get("PERF_QUICK") == "1", "PERF_QUICK=1: tests de precisión multimedia omitidos")
 class TestMultimediaControllerAccuracy(BaseAccuracyTest):
     """Test de accuracy para MultimediaControllerEnhanced."""
     
+    # Gestos multimedia a testear (tupla inmutable compartida, sin reconstruir en cada llamada)
+    _TEST_GESTURES = (
+        'play_pause',
+        'stop',
+        'next_track',
+        'previous_track',
+        'volume_up_media',
+        'volume_down_media',
+        'mute_media',
+        'fast_forward',
+        'rewind',
+        'repeat_toggle',
+        'shuffle_toggle',
+        'seek_forward',
+        'seek_backward',
+        'fullscreen_media',
+        'picture_in_picture',
+        'no_gesture'
+    )
+    
+    # Latencia simulada por gesto en segundos; 0 (por defecto) desactiva las pausas
+    SIMULATE_LATENCY_S = float(os.environ.get('GESTUREAI_SIM_LATENCY', '0'))
+    
     @classmethod
     def setUpClass(cls):
         """Configuración inicial para todos los tests."""
@@ -27,22 +90,18 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         cls.target_accuracy = 0.89  # 89% - Bueno para controles multimedia
         super().setUpClass()
         
-    def setUp(self):
-        """Configurar el test individual."""
-        super().setUp()
-        
-        # Mock de las dependencias multimedia
-        self.multimedia_patches = [
+        # Mock de las dependencias multimedia (una sola vez para toda la clase)
+        cls.multimedia_patches = [
             patch('pyautogui.press'),
             patch('pyautogui.hotkey'),
             patch('core.controllers.enhanced.multimedia_controller_enhanced.AudioUtilities'),
             patch('os.path.exists', return_value=True)
         ]
         
-        self.multimedia_mocks = [p.start() for p in self.multimedia_patches]
+        cls.multimedia_mocks = [p.start() for p in cls.multimedia_patches]
         
         # Configurar precisión específica por gesto multimedia
-        self.gesture_accuracy_rates = {
+        cls.gesture_accuracy_rates = {
             'play_pause': 0.94,          # Muy preciso, gesto común
             'stop': 0.91,                # Preciso, gesto distintivo
             'next_track': 0.88,          # Bueno, pero requiere timing
@@ -62,7 +121,7 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         }
         
         # Configurar confusiones comunes multimedia
-        self.common_confusions = {
+        cls.common_confusions = {
             'play_pause': {'stop': 0.04, 'no_gesture': 0.02},
             'stop': {'play_pause': 0.06, 'no_gesture': 0.03},
             'next_track': {'previous_track': 0.08, 'fast_forward': 0.04},
@@ -80,32 +139,47 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
             'picture_in_picture': {'fullscreen_media': 0.12, 'no_gesture': 0.07}
         }
         
-    def tearDown(self):
-        """Limpiar después del test."""
-        super().tearDown()
-        for patch_obj in self.multimedia_patches:
+        # Tablas de muestreo precalculadas: confusiones normalizadas y alternativas por gesto
+        cls._all_gestures = np.array(cls._TEST_GESTURES)
+        cls._confusion_choices: Dict[str, np.ndarray] = {}
+        cls._confusion_probs: Dict[str, np.ndarray] = {}
+        for gesture, confusions in cls.common_confusions.items():
+            probs = np.array(list(confusions.values()), dtype=np.float64)
+            cls._confusion_choices[gesture] = np.array(list(confusions.keys()))
+            cls._confusion_probs[gesture] = probs / probs.sum()
+        
+        # Códigos int8 por gesto: las simulaciones trabajan con enteros y solo se
+        # decodifican a texto (_all_gestures[códigos]) al registrar o imprimir
+        cls._gesture_to_id = {gesture: i for i, gesture in enumerate(cls._TEST_GESTURES)}
+        all_ids = np.arange(len(cls._TEST_GESTURES), dtype=np.int8)
+        cls._other_ids: Dict[str, np.ndarray] = {
+            gesture: all_ids[all_ids != gesture_id]
+            for gesture, gesture_id in cls._gesture_to_id.items()
+        }
+        
+        # Las mismas confusiones como códigos y CDF, para el kernel de decisión
+        cls._confusion_ids: Dict[str, np.ndarray] = {}
+        cls._confusion_cdf: Dict[str, np.ndarray] = {}
+        for gesture in cls._TEST_GESTURES:
+            choices = cls._confusion_choices.get(gesture, ())
+            cdf = np.cumsum(cls._confusion_probs.get(gesture, np.empty(0)))
+            if cdf.size:
+                cdf[-1] = 1.0  # Evitar que el redondeo deje fuera al último candidato
+            cls._confusion_ids[gesture] = np.array([cls._gesture_to_id[g] for g in choices], dtype=np.int8)
+            cls._confusion_cdf[gesture] = cdf
+        
+    @classmethod
+    def tearDownClass(cls):
+        """Limpiar después de todos los tests."""
+        for patch_obj in cls.multimedia_patches:
             patch_obj.stop()
-    
-    def get_test_gestures(self) -> List[str]:
-        """Retorna la lista de gestos multimedia a testear."""
-        return [
-            'play_pause',
-            'stop',
-            'next_track',
-            'previous_track',
-            'volume_up_media',
-            'volume_down_media',
-            'mute_media',
-            'fast_forward',
-            'rewind',
-            'repeat_toggle',
-            'shuffle_toggle',
-            'seek_forward',
-            'seek_backward',
-            'fullscreen_media',
-            'picture_in_picture',
-            'no_gesture'
-        ]
+        # Los lotes memorizados dependen de las tablas de la clase: no sobreviven a ella
+        cls._simulate_batch_cached.cache_clear()
+        super().tearDownClass()
+        
+    def get_test_gestures(self) -> Tuple[str, ...]:
+        """Retorna los gestos multimedia a testear."""
+        return self._TEST_GESTURES
     
     def simulate_gesture_detection(self, gesture: str, expected_confidence: float = 0.8) -> Tuple[str, float]:
         """
@@ -120,43 +194,151 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         """
         # Obtener tasa de precisión para este gesto
         accuracy_rate = self.gesture_accuracy_rates.get(gesture, 0.85)
+        gesture_id = self._gesture_to_id[gesture]
         
-        # Determinar si la predicción será correcta
-        is_correct = np.random.random() < accuracy_rate
+        # Decidir acierto, tipo de error y gesto detectado en el kernel compilado
+        predicted_id = _decide_gesture_id(self.rng.random(3), gesture_id, accuracy_rate,
+                                          self._confusion_ids[gesture], self._confusion_cdf[gesture],
+                                          len(self._all_gestures) - 1)
         
-        if is_correct:
+        if predicted_id == gesture_id:
             # Predicción correcta
             predicted_gesture = gesture
             # Variar ligeramente la confianza
-            confidence_variation = np.random.normal(0, 0.05)
+            confidence_variation = self.rng.normal(0, 0.05)
             confidence = np.clip(expected_confidence + confidence_variation, 0.3, 0.99)
         else:
             # Predicción incorrecta
-            confusions = self.common_confusions.get(gesture, {})
-            
-            if confusions and np.random.random() < 0.75:  # 75% de errores son confusiones comunes
-                confusion_gestures = list(confusions.keys())
-                confusion_probs = list(confusions.values())
-                
-                total_prob = sum(confusion_probs)
-                if total_prob > 0:
-                    confusion_probs = [p/total_prob for p in confusion_probs]
-                    predicted_gesture = np.random.choice(confusion_gestures, p=confusion_probs)
-                else:
-                    predicted_gesture = np.random.choice(self.get_test_gestures())
-            else:
-                # Error aleatorio
-                all_gestures = self.get_test_gestures()
-                predicted_gesture = np.random.choice([g for g in all_gestures if g != gesture])
+            predicted_gesture = self._all_gestures[predicted_id]
             
             # Confianza más baja para predicciones incorrectas
-            confidence = np.random.uniform(0.3, 0.65)
+            confidence = self.rng.uniform(0.3, 0.65)
         
-        # Simular tiempo de procesamiento
-        time.sleep(0.001)  # 1ms de procesamiento simulado
+        # Simular tiempo de procesamiento (sólo si se pide)
+        if self.SIMULATE_LATENCY_S:
+            time.sleep(self.SIMULATE_LATENCY_S)
         
         return predicted_gesture, confidence
     
+    def simulate_gesture_detection_batch(self, gesture: str, n: int, expected_confidence: float = 0.8,
+                                         stream: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula n detecciones de un mismo gesto con una sola extracción aleatoria por lote
+        
+        Cada lote es función determinista de sus argumentos y del test que lo pide, y se
+        memoriza, así que repetir la misma llamada dentro de un test no vuelve a muestrear.
+        Tests distintos obtienen lotes independientes aunque pidan los mismos parámetros.
+        
+        Args:
+            gesture: Nombre del gesto a simular
+            n: Número de muestras
+            expected_confidence: Nivel de confianza esperado
+            stream: Índice de flujo aleatorio, para obtener lotes independientes
+                con los mismos parámetros dentro de un test
+            
+        Returns:
+            Tupla (códigos int8 de los gestos detectados, confianzas) como arrays
+            de solo lectura de longitud n
+        """
+        return self._simulate_batch_cached(self.seed_label, gesture, n, expected_confidence, stream)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=64)
+    def _simulate_batch_cached(cls, seed_label: str, gesture: str, n: int, expected_confidence: float,
+                               stream: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Implementación memorizada de simulate_gesture_detection_batch (seed_label identifica al test)."""
+        rng = np.random.default_rng(derive_seed(seed_label, f"{gesture}/{n}/{expected_confidence}/{stream}"))
+        accuracy_rate = cls.gesture_accuracy_rates.get(gesture, 0.85)
+        
+        # Decidir aciertos y confianzas de todo el lote a la vez
+        correct_mask = rng.random(n) < accuracy_rate
+        confidence_correct = np.clip(expected_confidence + rng.normal(0, 0.05, n), 0.3, 0.99)
+        confidence_wrong = rng.uniform(0.3, 0.65, n)
+        confidences = np.where(correct_mask, confidence_correct, confidence_wrong)
+        
+        predictions = np.full(n, cls._gesture_to_id[gesture], dtype=np.int8)
+        wrong_idx = np.flatnonzero(~correct_mask)
+        
+        # 75% de errores son confusiones comunes, el resto errores aleatorios
+        confusion_ids = cls._confusion_ids[gesture]
+        if confusion_ids.size:
+            use_confusion = rng.random(wrong_idx.size) < 0.75
+        else:
+            use_confusion = np.zeros(wrong_idx.size, dtype=bool)
+        
+        confusion_idx = wrong_idx[use_confusion]
+        if confusion_idx.size:
+            picks = cls._confusion_cdf[gesture].searchsorted(rng.random(confusion_idx.size), side='right')
+            predictions[confusion_idx] = confusion_ids[picks]
+        
+        random_idx = wrong_idx[~use_confusion]
+        if random_idx.size:
+            other_ids = cls._other_ids[gesture]
+            predictions[random_idx] = other_ids[rng.integers(other_ids.size, size=random_idx.size)]
+        
+        # Los lotes memorizados se comparten entre llamadas: solo lectura
+        predictions.setflags(write=False)
+        confidences.setflags(write=False)
+        return predictions, confidences
+    
+    def simulate_gesture_sequence(self, gesture_ids: np.ndarray,
+                                  expected_confidence: float = 0.8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula una secuencia mixta de gestos con un lote por gesto distinto
+        
+        Las muestras de un mismo gesto son independientes entre sí, así que basta
+        agruparlas, simular cada grupo de una vez y devolverlas a su posición.
+        
+        Args:
+            gesture_ids: Códigos enteros (índices en _TEST_GESTURES) de la secuencia
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (códigos int8 de los gestos detectados, confianzas) alineada con gesture_ids
+        """
+        predictions = np.empty(gesture_ids.size, dtype=np.int8)
+        confidences = np.empty(gesture_ids.size)
+        
+        unique_ids, inverse = np.unique(gesture_ids, return_inverse=True)
+        for group, gesture_id in enumerate(unique_ids):
+            mask = inverse == group
+            predictions[mask], confidences[mask] = self.simulate_gesture_detection_batch(
+                self._TEST_GESTURES[gesture_id], int(np.count_nonzero(mask)), expected_confidence)
+        
+        return predictions, confidences
+    
+    def count_mutual_confusions(self, gesture_a: str, gesture_b: str, n: int,
+                                expected_confidence: float = 0.8) -> int:
+        """
+        Cuenta cuántas veces dos gestos se confunden entre sí en n muestras de cada uno
+        
+        Args:
+            gesture_a: Primer gesto del par
+            gesture_b: Segundo gesto del par
+            n: Muestras por gesto
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Número de detecciones de a como b más las de b como a
+        """
+        # Flujo aparte para no reutilizar las muestras del test de precisión por gesto
+        predictions_a, _ = self.simulate_gesture_detection_batch(gesture_a, n, expected_confidence, stream=1)
+        predictions_b, _ = self.simulate_gesture_detection_batch(gesture_b, n, expected_confidence, stream=1)
+        id_a, id_b = self._gesture_to_id[gesture_a], self._gesture_to_id[gesture_b]
+        return int(np.count_nonzero(predictions_a == id_b) + np.count_nonzero(predictions_b == id_a))
+    
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba no instalado: el kernel se ejecuta en Python")
+    def test_jit_kernel_matches_python(self):
+        """Test de que el kernel compilado decide igual que su versión Python"""
+        
+        for gesture in self._TEST_GESTURES:
+            args = (self._gesture_to_id[gesture], self.gesture_accuracy_rates.get(gesture, 0.85),
+                    self._confusion_ids[gesture], self._confusion_cdf[gesture], len(self._all_gestures) - 1)
+            
+            for draws in self.rng.random((50, 3)):
+                self.assertEqual(_decide_gesture_id(draws, *args), _decide_gesture_id.py_func(draws, *args),
+                                 f"El kernel compilado difiere de Python para {gesture}")
+    
     def test_basic_playback_controls_accuracy(self):
         """Test de precisión para controles básicos de reproducción"""
         basic_controls = ['play_pause', 'stop', 'next_track', 'previous_track']
@@ -164,19 +346,12 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         print(f"\n🎵 Testeando precisión de controles básicos...")
         
         for control in basic_controls:
-            predictions = []
-            ground_truth = []
-            
             # Test con múltiples muestras
-            for _ in range(22):  # 22 muestras por control básico
-                predicted, confidence = self.simulate_gesture_detection(control, 0.85)
-                predictions.append(predicted)
-                ground_truth.append(control)
-                
-                self.log_prediction(control, predicted, confidence)
+            predictions, confidences = self.simulate_gesture_detection_batch(control, _scaled(22), 0.85)  # 22 muestras por control básico
+            self.log_predictions(control, self._all_gestures[predictions], confidences)
             
             # Calcular precisión
-            accuracy = sum(1 for true_val, pred in zip(ground_truth, predictions) if true_val == pred) / len(predictions)
+            accuracy = np.count_nonzero(predictions == self._gesture_to_id[control]) / predictions.size
             
             # Verificar precisión mínima para controles básicos
             min_basic_accuracy = 0.85  # 85% mínimo para controles básicos
@@ -195,16 +370,11 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         control_results = {}
         
         for control in playback_controls:
-            correct_predictions = 0
-            total_predictions = 0
+            predictions, confidences = self.simulate_gesture_detection_batch(control, _scaled(20), 0.85)  # 20 muestras por control
+            self.log_predictions(control, self._all_gestures[predictions], confidences)
             
-            for _ in range(20):  # 20 muestras por control
-                predicted, confidence = self.simulate_gesture_detection(control, 0.85)
-                self.log_prediction(control, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == control:
-                    correct_predictions += 1
+            correct_predictions = np.count_nonzero(predictions == self._gesture_to_id[control])
+            total_predictions = predictions.size
             
             accuracy = correct_predictions / total_predictions
             control_results[control] = accuracy
@@ -213,24 +383,15 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {control}: {accuracy:.3f}")
         
         # Verificar discriminación específica
-        avg_playback_accuracy = np.mean(list(control_results.values()))
+        avg_playback_accuracy = sum(control_results.values()) / len(control_results)
         self.assertGreaterEqual(avg_playback_accuracy, 0.85,
                               f"Precisión promedio play/stop insuficiente: {avg_playback_accuracy:.3f}")
         
         # Test de confusión específica play_pause ↔ stop
-        play_stop_confusion = 0
-        for _ in range(20):
-            # Test play_pause que no debe ser stop
-            predicted, _ = self.simulate_gesture_detection('play_pause', 0.85)
-            if predicted == 'stop':
-                play_stop_confusion += 1
-                
-            # Test stop que no debe ser play_pause
-            predicted, _ = self.simulate_gesture_detection('stop', 0.85)
-            if predicted == 'play_pause':
-                play_stop_confusion += 1
+        probe_samples = _scaled(20)
+        play_stop_confusion = self.count_mutual_confusions('play_pause', 'stop', probe_samples, 0.85)
         
-        confusion_rate = play_stop_confusion / 40
+        confusion_rate = play_stop_confusion / (2 * probe_samples)
         print(f"   🔄 Confusión play_pause/stop: {confusion_rate:.3f}")
         
         self.assertLess(confusion_rate, 0.12,
@@ -245,16 +406,11 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         track_accuracies = {}
         
         for control in track_controls:
-            correct_predictions = 0
-            total_predictions = 0
+            predictions, confidences = self.simulate_gesture_detection_batch(control, _scaled(18), 0.8)  # 18 muestras por control
+            self.log_predictions(control, self._all_gestures[predictions], confidences)
             
-            for _ in range(18):  # 18 muestras por control
-                predicted, confidence = self.simulate_gesture_detection(control, 0.8)
-                self.log_prediction(control, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == control:
-                    correct_predictions += 1
+            correct_predictions = np.count_nonzero(predictions == self._gesture_to_id[control])
+            total_predictions = predictions.size
             
             accuracy = correct_predictions / total_predictions
             track_accuracies[control] = accuracy
@@ -263,24 +419,15 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {control}: {accuracy:.3f}")
         
         # Verificar precisión direccional de navegación
-        avg_track_accuracy = np.mean(list(track_accuracies.values()))
+        avg_track_accuracy = sum(track_accuracies.values()) / len(track_accuracies)
         self.assertGreaterEqual(avg_track_accuracy, 0.80,
                               f"Precisión promedio navegación pistas insuficiente: {avg_track_accuracy:.3f}")
         
         # Test de discriminación direccional
-        direction_confusion = 0
-        for _ in range(20):
-            # Test next_track que no debe ser previous_track
-            predicted, _ = self.simulate_gesture_detection('next_track', 0.8)
-            if predicted == 'previous_track':
-                direction_confusion += 1
-                
-            # Test previous_track que no debe ser next_track
-            predicted, _ = self.simulate_gesture_detection('previous_track', 0.8)
-            if predicted == 'next_track':
-                direction_confusion += 1
+        probe_samples = _scaled(20)
+        direction_confusion = self.count_mutual_confusions('next_track', 'previous_track', probe_samples, 0.8)
         
-        direction_confusion_rate = direction_confusion / 40
+        direction_confusion_rate = direction_confusion / (2 * probe_samples)
         print(f"   🔄 Confusión direccional: {direction_confusion_rate:.3f}")
         
         self.assertLess(direction_confusion_rate, 0.15,
@@ -295,16 +442,11 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         volume_accuracies = {}
         
         for control in volume_controls:
-            correct_predictions = 0
-            total_predictions = 0
+            predictions, confidences = self.simulate_gesture_detection_batch(control, _scaled(18), 0.8)  # 18 muestras por control
+            self.log_predictions(control, self._all_gestures[predictions], confidences)
             
-            for _ in range(18):  # 18 muestras por control
-                predicted, confidence = self.simulate_gesture_detection(control, 0.8)
-                self.log_prediction(control, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == control:
-                    correct_predictions += 1
+            correct_predictions = np.count_nonzero(predictions == self._gesture_to_id[control])
+            total_predictions = predictions.size
             
             accuracy = correct_predictions / total_predictions
             volume_accuracies[control] = accuracy
@@ -313,7 +455,7 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {control}: {accuracy:.3f}")
         
         # Verificar precisión de controles de volumen
-        avg_volume_accuracy = np.mean(list(volume_accuracies.values()))
+        avg_volume_accuracy = sum(volume_accuracies.values()) / len(volume_accuracies)
         self.assertGreaterEqual(avg_volume_accuracy, 0.85,
                               f"Precisión promedio volumen multimedia insuficiente: {avg_volume_accuracy:.3f}")
     
@@ -326,18 +468,11 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         seek_results = {}
         
         for control in seek_controls:
-            predictions = []
-            confidences = []
-            
-            for _ in range(15):  # 15 muestras por control (más difíciles)
-                predicted, confidence = self.simulate_gesture_detection(control, 0.75)
-                self.log_prediction(control, predicted, confidence)
-                
-                predictions.append(predicted == control)
-                confidences.append(confidence)
+            predictions, confidences = self.simulate_gesture_detection_batch(control, _scaled(15), 0.75)  # 15 muestras por control (más difíciles)
+            self.log_predictions(control, self._all_gestures[predictions], confidences)
             
-            accuracy = np.mean(predictions)
-            avg_confidence = np.mean(confidences)
+            accuracy = (predictions == self._gesture_to_id[control]).mean()
+            avg_confidence = confidences.mean()
             
             seek_results[control] = {
                 'accuracy': accuracy,
@@ -350,24 +485,15 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {control}: Precisión {accuracy:.3f}, Confianza {avg_confidence:.3f}")
         
         # Verificar precisión mínima de seeking
-        avg_seek_accuracy = np.mean([r['accuracy'] for r in seek_results.values()])
+        avg_seek_accuracy = sum(r['accuracy'] for r in seek_results.values()) / len(seek_results)
         self.assertGreaterEqual(avg_seek_accuracy, 0.75,
                               f"Precisión promedio seeking insuficiente: {avg_seek_accuracy:.3f}")
         
         # Test de discriminación fast_forward vs seek_forward
-        ff_seek_confusion = 0
-        for _ in range(15):
-            # Test fast_forward que no debe ser seek_forward
-            predicted, _ = self.simulate_gesture_detection('fast_forward', 0.75)
-            if predicted == 'seek_forward':
-                ff_seek_confusion += 1
-                
-            # Test seek_forward que no debe ser fast_forward
-            predicted, _ = self.simulate_gesture_detection('seek_forward', 0.75)
-            if predicted == 'fast_forward':
-                ff_seek_confusion += 1
+        probe_samples = _scaled(15)
+        ff_seek_confusion = self.count_mutual_confusions('fast_forward', 'seek_forward', probe_samples, 0.75)
         
-        ff_seek_confusion_rate = ff_seek_confusion / 30
+        ff_seek_confusion_rate = ff_seek_confusion / (2 * probe_samples)
         print(f"   🔄 Confusión fast_forward/seek: {ff_seek_confusion_rate:.3f}")
         
         # Alguna confusión es aceptable para gestos similares
@@ -377,22 +503,17 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
     def test_toggle_controls_accuracy(self):
         """Test de precisión para controles de toggle (repeat/shuffle)"""
         
-        print(f("\n🔁🔀 Testeando precisión de controles toggle..."))
+        print(f"\n🔁🔀 Testeando precisión de controles toggle...")
         
         toggle_controls = ['repeat_toggle', 'shuffle_toggle']
         toggle_accuracies = {}
         
         for control in toggle_controls:
-            correct_predictions = 0
-            total_predictions = 0
+            predictions, confidences = self.simulate_gesture_detection_batch(control, _scaled(15), 0.75)  # 15 muestras por toggle
+            self.log_predictions(control, self._all_gestures[predictions], confidences)
             
-            for _ in range(15):  # 15 muestras por toggle
-                predicted, confidence = self.simulate_gesture_detection(control, 0.75)
-                self.log_prediction(control, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == control:
-                    correct_predictions += 1
+            correct_predictions = np.count_nonzero(predictions == self._gesture_to_id[control])
+            total_predictions = predictions.size
             
             accuracy = correct_predictions / total_predictions
             toggle_accuracies[control] = accuracy
@@ -403,24 +524,15 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {control}: {accuracy:.3f}")
         
         # Verificar precisión promedio de toggles
-        avg_toggle_accuracy = np.mean(list(toggle_accuracies.values()))
+        avg_toggle_accuracy = sum(toggle_accuracies.values()) / len(toggle_accuracies)
         self.assertGreaterEqual(avg_toggle_accuracy, 0.70,
                               f"Precisión promedio toggles insuficiente: {avg_toggle_accuracy:.3f}")
         
         # Test de discriminación repeat vs shuffle
-        repeat_shuffle_confusion = 0
-        for _ in range(15):
-            # Test repeat_toggle que no debe ser shuffle_toggle
-            predicted, _ = self.simulate_gesture_detection('repeat_toggle', 0.75)
-            if predicted == 'shuffle_toggle':
-                repeat_shuffle_confusion += 1
-                
-            # Test shuffle_toggle que no debe ser repeat_toggle
-            predicted, _ = self.simulate_gesture_detection('shuffle_toggle', 0.75)
-            if predicted == 'repeat_toggle':
-                repeat_shuffle_confusion += 1
+        probe_samples = _scaled(15)
+        repeat_shuffle_confusion = self.count_mutual_confusions('repeat_toggle', 'shuffle_toggle', probe_samples, 0.75)
         
-        confusion_rate = repeat_shuffle_confusion / 30
+        confusion_rate = repeat_shuffle_confusion / (2 * probe_samples)
         print(f"   🔄 Confusión repeat/shuffle: {confusion_rate:.3f}")
         
         # Estos gestos pueden ser confusos entre sí
@@ -444,30 +556,30 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         workflow_accuracies = []
         
         for i, workflow in enumerate(media_workflows):
-            workflow_predictions = []
-            workflow_ground_truth = []
+            workflow_ground_truth = np.array(workflow)
+            workflow_predictions = np.empty(len(workflow), dtype=self._all_gestures.dtype)
+            workflow_confidences = np.empty(len(workflow))
             
             print(f"   🎬 Workflow {i+1}: {' → '.join(workflow)}")
             
-            for gesture in workflow:
-                predicted, confidence = self.simulate_gesture_detection(gesture, 0.8)
-                workflow_predictions.append(predicted)
-                workflow_ground_truth.append(gesture)
-                
-                self.log_prediction(gesture, predicted, confidence)
+            for j, gesture in enumerate(workflow):
+                workflow_predictions[j], workflow_confidences[j] = self.simulate_gesture_detection(gesture, 0.8)
                 
                 # Pausa entre gestos de workflow
-                time.sleep(0.002)
+                if self.SIMULATE_LATENCY_S:
+                    time.sleep(self.SIMULATE_LATENCY_S)
+            
+            self.log_predictions(workflow_ground_truth, workflow_predictions, workflow_confidences)
             
             # Calcular precisión de este workflow
-            workflow_accuracy = sum(1 for true_val, pred in zip(workflow_ground_truth, workflow_predictions) 
-                                  if true_val == pred) / len(workflow)
+            workflow_hits = workflow_predictions == workflow_ground_truth
+            workflow_accuracy = np.count_nonzero(workflow_hits) / workflow_hits.size
             workflow_accuracies.append(workflow_accuracy)
             
             print(f"      Precisión: {workflow_accuracy:.3f}")
         
         # Verificar precisión promedio de workflows
-        avg_workflow_accuracy = np.mean(workflow_accuracies)
+        avg_workflow_accuracy = sum(workflow_accuracies) / len(workflow_accuracies)
         
         print(f"   📊 Precisión promedio workflows: {avg_workflow_accuracy:.3f}")
         
@@ -490,21 +602,14 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         complexity_metrics = {}
         
         for complexity, gestures in complexity_groups.items():
-            group_confidences = []
-            group_accuracies = []
-            
-            for gesture in gestures:
-                for _ in range(10):  # 10 muestras por gesto
-                    predicted, confidence = self.simulate_gesture_detection(gesture, 0.8)
-                    
-                    is_correct = (predicted == gesture)
-                    group_confidences.append(confidence)
-                    group_accuracies.append(is_correct)
-                    
-                    self.log_prediction(gesture, predicted, confidence)
-            
-            avg_confidence = np.mean(group_confidences)
-            avg_accuracy = np.mean(group_accuracies)
+            # Plan de muestras aplanado del grupo: 10 muestras por gesto
+            gesture_ids = np.repeat(np.array([self._gesture_to_id[g] for g in gestures], dtype=np.int8), _scaled(10))
+            
+            predictions, confidences = self.simulate_gesture_sequence(gesture_ids, 0.8)
+            self.log_predictions(self._all_gestures[gesture_ids], self._all_gestures[predictions], confidences)
+            
+            avg_confidence = confidences.mean()
+            avg_accuracy = (predictions == gesture_ids).mean()
             
             complexity_metrics[complexity] = {
                 'confidence': avg_confidence,
@@ -532,35 +637,32 @@ class TestMultimediaControllerAccuracy(BaseAccuracyTest):
         print(f"\n🔄 Testeando uso continuo multimedia...")
         
         # Simular sesión de uso continuo con gestos comunes
-        continuous_sequence = []
         common_gestures = ['play_pause', 'volume_up_media', 'volume_down_media', 
                           'next_track', 'previous_track', 'mute_media']
         
-        for _ in range(25):  # 25 ciclos de gestos comunes
-            continuous_sequence.extend(common_gestures)
+        start_time = time.perf_counter()
         
-        # Mezclar para simular uso real
-        np.random.shuffle(continuous_sequence)
+        # 25 ciclos de gestos comunes, mezclados para simular uso real
+        common_ids = np.array([self._gesture_to_id[g] for g in common_gestures], dtype=np.int8)
+        gesture_ids = np.tile(common_ids, _scaled(25))
+        self.rng.shuffle(gesture_ids)
         
-        continuous_results = []
-        start_time = time.time()
+        predictions, confidences = self.simulate_gesture_sequence(gesture_ids, 0.8)
         
-        for gesture in continuous_sequence:
-            predicted, confidence = self.simulate_gesture_detection(gesture, 0.8)
-            self.log_prediction(gesture, predicted, confidence)
-            
-            continuous_results.append(predicted == gesture)
-            
-            # Simular uso continuo con pausas cortas
-            time.sleep(0.0008)  # 0.8ms entre gestos
+        self.log_predictions(self._all_gestures[gesture_ids], self._all_gestures[predictions], confidences)
+        continuous_results = predictions == gesture_ids
+        
+        # Simular uso continuo con pausas cortas
+        if self.SIMULATE_LATENCY_S:
+            time.sleep(self.SIMULATE_LATENCY_S * gesture_ids.size)
         
-        total_time = time.time() - start_time
-        continuous_accuracy = np.mean(continuous_results)
+        total_time = time.perf_counter() - start_time
+        continuous_accuracy = continuous_results.mean()
         
-        print(f"   🎵 Gestos procesados: {len(continuous_sequence)}")
+        print(f"   🎵 Gestos procesados: {gesture_ids.size}")
         print(f"   ⏱️ Tiempo total: {total_time:.3f}s")
         print(f"   🎯 Precisión uso continuo: {continuous_accuracy:.3f}")
-        print(f"   📈 Gestos/segundo: {len(continuous_sequence)/total_time:.1f}")
+        print(f"   📈 Gestos/segundo: {gesture_ids.size/total_time:.1f}")
         
         # Verificar que la precisión se mantiene en uso continuo
         self.assertGreaterEqual(continuous_accuracy, 0.82,
@@ -2,24 +2,81 @@
 """
 Tests de precisión para NavigationControllerEnhanced.
 Mide la precisión de detección de gestos de navegación web y direccional.
+
+Los tests son independientes entre sí y pueden ejecutarse en paralelo con pytest-xdist:
+    pytest tests/performance/metrics/accuracy/test_navigation_controller_accuracy.py -n auto
 """
 
 import sys
 import os
 import time
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, MagicMock, patch
 import numpy as np
 from typing import List, Tuple, Dict, Any
 
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
 
-from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest
+from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest, NUMBA_AVAILABLE, njit
+
+# cache=True guarda el código compilado junto al módulo (__pycache__), así que sólo la primera
+# ejecución paga la compilación; las siguientes, también en CI con caché, lo cargan del disco
+@njit(cache=True)
+def _simulate_kernel(draws, gesture_id, accuracy_rate, confusion_choices, confusion_cum, n_others):
+    """
+    Decide el id del gesto detectado a partir de tres uniformes ya extraídos
+    
+    Args:
+        draws: Uniformes en [0, 1) para acierto, tipo de error y selección
+        gesture_id: Id del gesto verdadero
+        accuracy_rate: Probabilidad de acierto del gesto
+        confusion_choices: Ids de los gestos con los que suele confundirse
+        confusion_cum: Probabilidades acumuladas de esas confusiones
+        n_others: Cantidad de gestos candidatos para un error aleatorio
+        
+    Returns:
+        Id del gesto detectado
+    """
+    if draws[0] < accuracy_rate:
+        return gesture_id
+    
+    # 75% de errores son confusiones comunes: CDF inversa por recorrido lineal (K <= 2)
+    if confusion_choices.size > 0 and draws[1] < 0.75:
+        for k in range(confusion_choices.size - 1):
+            if draws[2] < confusion_cum[k]:
+                return confusion_choices[k]
+        return confusion_choices[confusion_choices.size - 1]
+    
+    # Error aleatorio: cualquier otro gesto, saltando el verdadero
+    other_id = int(draws[2] * n_others)
+    if other_id >= gesture_id:
+        other_id += 1
+    return other_id
 
 class TestNavigationControllerAccuracy(BaseAccuracyTest):
     """Test de accuracy para NavigationControllerEnhanced."""
     
+    # Gestos de navegación a testear (tupla inmutable compartida, sin reconstruir en cada llamada)
+    _TEST_GESTURES = (
+        'navigate_back',
+        'navigate_forward',
+        'refresh',
+        'new_tab',
+        'close_tab',
+        'switch_tab_left',
+        'switch_tab_right',
+        'scroll_page_up',
+        'scroll_page_down',
+        'home',
+        'bookmark',
+        'search',
+        'zoom_in',
+        'zoom_out',
+        'fullscreen',
+        'no_gesture'
+    )
+    
     @classmethod
     def setUpClass(cls):
         """Configuración inicial para todos los tests."""
@@ -27,23 +84,18 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         cls.target_accuracy = 0.91  # 91% - Alto para navegación frecuente
         super().setUpClass()
         
-    def setUp(self):
-        """Configurar el test individual."""
-        super().setUp()
-        
-        # Mock de las dependencias de navegación
-        self.navigation_patches = [
-            patch('pyautogui.press'),
-            patch('pyautogui.hotkey'),
-            patch('pyautogui.click'),
-            patch('pyautogui.moveTo'),
-            patch('os.path.exists', return_value=True)
-        ]
-        
-        self.navigation_mocks = [p.start() for p in self.navigation_patches]
+        # Mock de las dependencias de navegación, una sola vez para toda la clase:
+        # pyautogui nunca se invoca aquí, así que se sustituye el módulo completo con
+        # patch.dict, que restaura sys.modules tal como estaba al terminar la clase
+        cls._pyautogui_patch = patch.dict(sys.modules, {'pyautogui': MagicMock()})
+        cls._pyautogui_patch.start()
+        cls.addClassCleanup(cls._pyautogui_patch.stop)
+        cls._exists_patch = patch('os.path.exists', return_value=True)
+        cls._exists_patch.start()
+        cls.addClassCleanup(cls._exists_patch.stop)
         
         # Configurar precisión específica por gesto de navegación
-        self.gesture_accuracy_rates = {
+        gesture_accuracy_rates = {
             'navigate_back': 0.96,       # Muy preciso, gesto común
             'navigate_forward': 0.95,    # Muy preciso, gesto común
             'refresh': 0.93,             # Preciso, gesto distintivo
@@ -63,7 +115,7 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         }
         
         # Configurar confusiones comunes de navegación
-        self.common_confusions = {
+        common_confusions = {
             'navigate_back': {'navigate_forward': 0.03, 'no_gesture': 0.01},
             'navigate_forward': {'navigate_back': 0.04, 'no_gesture': 0.01},
             'switch_tab_left': {'switch_tab_right': 0.07, 'navigate_back': 0.03},
@@ -80,32 +132,33 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
             'fullscreen': {'zoom_in': 0.06, 'no_gesture': 0.08}
         }
         
-    def tearDown(self):
-        """Limpiar después del test."""
-        super().tearDown()
-        for patch_obj in self.navigation_patches:
-            patch_obj.stop()
-    
-    def get_test_gestures(self) -> List[str]:
-        """Retorna la lista de gestos de navegación a testear."""
-        return [
-            'navigate_back',
-            'navigate_forward',
-            'refresh',
-            'new_tab',
-            'close_tab',
-            'switch_tab_left',
-            'switch_tab_right',
-            'scroll_page_up',
-            'scroll_page_down',
-            'home',
-            'bookmark',
-            'search',
-            'zoom_in',
-            'zoom_out',
-            'fullscreen',
-            'no_gesture'
-        ]
+        # Tablas de consulta por id de gesto (estructura de arrays), construidas una sola vez;
+        # los diccionarios de configuración no se conservan como atributos
+        cls.gesture_ids = {gesture: i for i, gesture in enumerate(cls._TEST_GESTURES)}
+        cls.gesture_arr = np.array(cls._TEST_GESTURES)
+        cls.accuracy_arr = np.array([gesture_accuracy_rates[g] for g in cls._TEST_GESTURES], dtype=np.float32)
+        cls.confusion_choices: List[np.ndarray] = []
+        cls.confusion_cum: List[np.ndarray] = []
+        for gesture in cls._TEST_GESTURES:
+            confusions = common_confusions.get(gesture, {})
+            probs = np.array(list(confusions.values()), dtype=np.float32)
+            cls.confusion_choices.append(np.array([cls.gesture_ids[g] for g in confusions], dtype=np.int8))
+            cls.confusion_cum.append(np.cumsum(probs / probs.sum()) if probs.size else probs)
+        all_ids = np.arange(len(cls.gesture_arr))
+        cls.other_ids = [all_ids[all_ids != i] for i in all_ids]
+        
+        # Versión rellenada (K, max_confusiones) de las mismas tablas, para lotes de gestos mezclados
+        max_confusions = max(choices.size for choices in cls.confusion_choices)
+        cls.confusion_counts = np.array([choices.size for choices in cls.confusion_choices], dtype=np.int8)
+        cls.confusion_table = np.zeros((len(cls.gesture_arr), max_confusions), dtype=np.int8)
+        cls.confusion_cum_table = np.ones((len(cls.gesture_arr), max_confusions), dtype=np.float32)
+        for i, (choices, cum) in enumerate(zip(cls.confusion_choices, cls.confusion_cum)):
+            cls.confusion_table[i, :choices.size] = choices
+            cls.confusion_cum_table[i, :cum.size] = cum
+        
+    def get_test_gestures(self) -> Tuple[str, ...]:
+        """Retorna los gestos de navegación a testear."""
+        return self._TEST_GESTURES
     
     def simulate_gesture_detection(self, gesture: str, expected_confidence: float = 0.8) -> Tuple[str, float]:
         """
@@ -119,72 +172,159 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
             Tupla (gesto_detectado, confianza_real)
         """
         # Obtener tasa de precisión para este gesto
-        accuracy_rate = self.gesture_accuracy_rates.get(gesture, 0.85)
+        gesture_id = self.gesture_ids[gesture]
+        accuracy_rate = self.accuracy_arr[gesture_id]
         
-        # Determinar si la predicción será correcta
-        is_correct = np.random.random() < accuracy_rate
+        # Decidir acierto, tipo de error y gesto detectado en el kernel compilado
+        predicted_id = _simulate_kernel(self.rng.random(3), gesture_id, accuracy_rate,
+                                        self.confusion_choices[gesture_id], self.confusion_cum[gesture_id],
+                                        len(self.gesture_arr) - 1)
         
-        if is_correct:
+        if predicted_id == gesture_id:
             # Predicción correcta
             predicted_gesture = gesture
             # Variar ligeramente la confianza
-            confidence_variation = np.random.normal(0, 0.04)
+            confidence_variation = self.rng.normal(0, 0.04)
             confidence = np.clip(expected_confidence + confidence_variation, 0.3, 0.99)
         else:
             # Predicción incorrecta
-            confusions = self.common_confusions.get(gesture, {})
-            
-            if confusions and np.random.random() < 0.75:  # 75% de errores son confusiones comunes
-                confusion_gestures = list(confusions.keys())
-                confusion_probs = list(confusions.values())
-                
-                total_prob = sum(confusion_probs)
-                if total_prob > 0:
-                    confusion_probs = [p/total_prob for p in confusion_probs]
-                    predicted_gesture = np.random.choice(confusion_gestures, p=confusion_probs)
-                else:
-                    predicted_gesture = np.random.choice(self.get_test_gestures())
-            else:
-                # Error aleatorio
-                all_gestures = self.get_test_gestures()
-                predicted_gesture = np.random.choice([g for g in all_gestures if g != gesture])
+            predicted_gesture = self.gesture_arr[predicted_id]
             
             # Confianza más baja para predicciones incorrectas
-            confidence = np.random.uniform(0.3, 0.65)
-        
-        # Simular tiempo de procesamiento
-        time.sleep(0.001)  # 1ms de procesamiento simulado
+            confidence = self.rng.uniform(0.3, 0.65)
         
         return predicted_gesture, confidence
     
+    def _simulate_batch(self, gesture: str, n: int, expected_confidence: float = 0.8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula n detecciones de un mismo gesto de navegación con una extracción por lote
+        
+        Args:
+            gesture: Nombre del gesto a simular
+            n: Número de muestras
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (gestos_detectados, confianzas) como arrays de longitud n
+        """
+        gesture_id = self.gesture_ids[gesture]
+        accuracy_rate = self.accuracy_arr[gesture_id]
+        
+        # Aciertos y confianzas de todo el lote en una sola extracción
+        correct_mask = self.rng.random(n) < accuracy_rate
+        confidences = np.where(correct_mask,
+                               np.clip(expected_confidence + self.rng.normal(0, 0.04, n), 0.3, 0.99),
+                               self.rng.uniform(0.3, 0.65, n))
+        
+        predicted_ids = np.full(n, gesture_id)
+        wrong_idx = np.flatnonzero(~correct_mask)
+        
+        # 75% de errores son confusiones comunes, el resto errores aleatorios
+        confusion_choices = self.confusion_choices[gesture_id]
+        if confusion_choices.size:
+            use_confusion = self.rng.random(wrong_idx.size) < 0.75
+        else:
+            use_confusion = np.zeros(wrong_idx.size, dtype=bool)
+        
+        confusion_idx = wrong_idx[use_confusion]
+        if confusion_idx.size:
+            # CDF inversa precalculada: searchsorted en lugar de rng.choice(p=...) por llamada
+            picks = np.searchsorted(self.confusion_cum[gesture_id], self.rng.random(confusion_idx.size), side='right')
+            predicted_ids[confusion_idx] = confusion_choices[np.minimum(picks, confusion_choices.size - 1)]
+        
+        random_idx = wrong_idx[~use_confusion]
+        if random_idx.size:
+            predicted_ids[random_idx] = self.rng.choice(self.other_ids[gesture_id], size=random_idx.size)
+        
+        return self.gesture_arr[predicted_ids], confidences
+    
+    def _simulate_batch_ids(self, gesture_ids: np.ndarray, expected_confidence: float = 0.8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula la detección de un lote de gestos distintos, dados por su id
+        
+        Args:
+            gesture_ids: Ids de los gestos verdaderos (int8)
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (ids_detectados, confianzas) como arrays de la misma longitud
+        """
+        n = gesture_ids.size
+        
+        # Aciertos y confianzas de todo el lote, con la tasa de precisión de cada gesto
+        correct_mask = self.rng.random(n) < self.accuracy_arr[gesture_ids]
+        confidences = np.where(correct_mask,
+                               np.clip(expected_confidence + self.rng.normal(0, 0.04, n), 0.3, 0.99),
+                               self.rng.uniform(0.3, 0.65, n))
+        
+        # 75% de errores son confusiones comunes (si el gesto las tiene), el resto errores aleatorios
+        n_confusions = self.confusion_counts[gesture_ids]
+        use_confusion = (self.rng.random(n) < 0.75) & (n_confusions > 0)
+        
+        # CDF inversa por fila sobre las tablas rellenadas
+        u = self.rng.random(n)
+        picks = np.minimum((self.confusion_cum_table[gesture_ids] <= u[:, None]).sum(axis=1),
+                           np.maximum(n_confusions - 1, 0))
+        confusion_ids = self.confusion_table[gesture_ids, picks]
+        
+        # Error aleatorio: cualquier otro gesto, saltando el verdadero
+        random_ids = (self.rng.random(n) * (len(self.gesture_arr) - 1)).astype(np.int8)
+        random_ids += random_ids >= gesture_ids
+        
+        predicted_ids = np.where(correct_mask, gesture_ids,
+                                 np.where(use_confusion, confusion_ids, random_ids)).astype(np.int8)
+        return predicted_ids, confidences
+    
+    def _measure_batch_accuracy(self, gesture: str, n: int, expected_confidence: float = 0.8) -> Tuple[float, np.ndarray]:
+        """
+        Simula y registra n detecciones de un gesto y calcula su precisión
+        
+        Args:
+            gesture: Nombre del gesto a simular
+            n: Número de muestras
+            expected_confidence: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (precisión, confianzas)
+        """
+        predictions, confidences = self._simulate_batch(gesture, n, expected_confidence)
+        self.log_predictions(gesture, predictions, confidences)
+        return np.count_nonzero(predictions == gesture) / predictions.size, confidences
+    
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba no instalado: el kernel se ejecuta en Python")
+    def test_jit_kernel_matches_python(self):
+        """Test de que el kernel compilado decide igual que su versión Python"""
+        
+        for gesture_id in range(len(self.gesture_arr)):
+            args = (gesture_id, self.accuracy_arr[gesture_id], self.confusion_choices[gesture_id],
+                    self.confusion_cum[gesture_id], len(self.gesture_arr) - 1)
+            
+            for draws in self.rng.random((50, 3)):
+                self.assertEqual(_simulate_kernel(draws, *args), _simulate_kernel.py_func(draws, *args),
+                                 f"El kernel compilado difiere de Python para {self.gesture_arr[gesture_id]}")
+    
     def test_basic_navigation_accuracy(self):
         """Test de precisión para navegación básica"""
-        basic_nav = ['navigate_back', 'navigate_forward', 'refresh', 'home']
+        # (gesto, muestras, precisión mínima): 20 muestras por gesto básico, 88% mínimo
+        basic_nav_cases = [
+            ('navigate_back', 20, 0.88),
+            ('navigate_forward', 20, 0.88),
+            ('refresh', 20, 0.88),
+            ('home', 20, 0.88)
+        ]
         
         print(f"\n🧭 Testeando precisión de navegación básica...")
         
-        for nav_gesture in basic_nav:
-            predictions = []
-            ground_truth = []
-            
-            # Test con múltiples muestras
-            for _ in range(20):  # 20 muestras por gesto básico
-                predicted, confidence = self.simulate_gesture_detection(nav_gesture, 0.85)
-                predictions.append(predicted)
-                ground_truth.append(nav_gesture)
+        for nav_gesture, n_samples, min_basic_nav_accuracy in basic_nav_cases:
+            # subTest atribuye cada fallo a su gesto sin detener el resto de casos
+            with self.subTest(gesture=nav_gesture):
+                accuracy, _ = self._measure_batch_accuracy(nav_gesture, n_samples, 0.85)
                 
-                self.log_prediction(nav_gesture, predicted, confidence)
-            
-            # Calcular precisión
-            accuracy = sum(1 for true_val, pred in zip(ground_truth, predictions) if true_val == pred) / len(predictions)
-            
-            # Verificar precisión mínima para navegación básica
-            min_basic_nav_accuracy = 0.88  # 88% mínimo para navegación básica
-            self.assertGreaterEqual(accuracy, min_basic_nav_accuracy,
-                                  f"Precisión de {nav_gesture} demasiado baja: {accuracy:.3f} < {min_basic_nav_accuracy:.3f}")
-            
-            status = "✅" if accuracy >= min_basic_nav_accuracy else "⚠️"
-            print(f"   {status} {nav_gesture}: {accuracy:.3f}")
+                status = "✅" if accuracy >= min_basic_nav_accuracy else "⚠️"
+                print(f"   {status} {nav_gesture}: {accuracy:.3f}")
+                
+                self.assertGreaterEqual(accuracy, min_basic_nav_accuracy,
+                                      f"Precisión de {nav_gesture} demasiado baja: {accuracy:.3f} < {min_basic_nav_accuracy:.3f}")
     
     def test_back_forward_discrimination(self):
         """Test de discriminación entre navegación back y forward"""
@@ -192,36 +332,17 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         print(f"\n⬅️➡️ Testeando discriminación back/forward...")
         
         # Test específico para evitar confusiones direccionales
-        back_tests = []
-        forward_tests = []
-        
-        for _ in range(20):
-            # Test back
-            predicted, confidence = self.simulate_gesture_detection('navigate_back', 0.85)
-            back_tests.append({
-                'predicted': predicted,
-                'confidence': confidence,
-                'correct': predicted == 'navigate_back',
-                'directional_confusion': predicted == 'navigate_forward'
-            })
-            self.log_prediction('navigate_back', predicted, confidence)
-            
-            # Test forward
-            predicted, confidence = self.simulate_gesture_detection('navigate_forward', 0.85)
-            forward_tests.append({
-                'predicted': predicted,
-                'confidence': confidence,
-                'correct': predicted == 'navigate_forward',
-                'directional_confusion': predicted == 'navigate_back'
-            })
-            self.log_prediction('navigate_forward', predicted, confidence)
-        
-        # Analizar resultados direccionales
-        back_accuracy = np.mean([t['correct'] for t in back_tests])
-        forward_accuracy = np.mean([t['correct'] for t in forward_tests])
-        
-        back_confusion_rate = np.mean([t['directional_confusion'] for t in back_tests])
-        forward_confusion_rate = np.mean([t['directional_confusion'] for t in forward_tests])
+        back_predictions, back_confidences = self._simulate_batch('navigate_back', 20, 0.85)
+        forward_predictions, forward_confidences = self._simulate_batch('navigate_forward', 20, 0.85)
+        self.log_predictions('navigate_back', back_predictions, back_confidences)
+        self.log_predictions('navigate_forward', forward_predictions, forward_confidences)
+        
+        # Analizar resultados direccionales: precisión y confusión salen del mismo lote
+        back_accuracy = np.count_nonzero(back_predictions == 'navigate_back') / back_predictions.size
+        forward_accuracy = np.count_nonzero(forward_predictions == 'navigate_forward') / forward_predictions.size
+        
+        back_confusion_rate = np.count_nonzero(back_predictions == 'navigate_forward') / back_predictions.size
+        forward_confusion_rate = np.count_nonzero(forward_predictions == 'navigate_back') / forward_predictions.size
         
         print(f"   ⬅️ Precisión back: {back_accuracy:.3f}")
         print(f"   ➡️ Precisión forward: {forward_accuracy:.3f}")
@@ -243,18 +364,7 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         tab_accuracies = {}
         
         for tab_gesture in tab_gestures:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(18):  # 18 muestras por gesto de pestaña
-                predicted, confidence = self.simulate_gesture_detection(tab_gesture, 0.8)
-                self.log_prediction(tab_gesture, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == tab_gesture:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
+            accuracy, _ = self._measure_batch_accuracy(tab_gesture, 18, 0.8)  # 18 muestras por gesto de pestaña
             tab_accuracies[tab_gesture] = accuracy
             
             # Umbral específico para cada tipo de gesto de pestaña
@@ -263,22 +373,15 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {tab_gesture}: {accuracy:.3f}")
         
         # Verificar precisión promedio de gestión de pestañas
-        avg_tab_accuracy = np.mean(list(tab_accuracies.values()))
+        avg_tab_accuracy = sum(tab_accuracies.values()) / len(tab_accuracies)
         self.assertGreaterEqual(avg_tab_accuracy, 0.82,
                               f"Precisión promedio gestión pestañas insuficiente: {avg_tab_accuracy:.3f}")
         
         # Test específico de discriminación tab switching
-        tab_switch_confusion = 0
-        for _ in range(20):
-            # Test switch_tab_left que no debe ser switch_tab_right
-            predicted, _ = self.simulate_gesture_detection('switch_tab_left', 0.8)
-            if predicted == 'switch_tab_right':
-                tab_switch_confusion += 1
-                
-            # Test switch_tab_right que no debe ser switch_tab_left
-            predicted, _ = self.simulate_gesture_detection('switch_tab_right', 0.8)
-            if predicted == 'switch_tab_left':
-                tab_switch_confusion += 1
+        # Test switch_tab_left que no debe ser switch_tab_right, y viceversa
+        predictions_a, _ = self._simulate_batch('switch_tab_left', 20, 0.8)
+        predictions_b, _ = self._simulate_batch('switch_tab_right', 20, 0.8)
+        tab_switch_confusion = np.count_nonzero(predictions_a == 'switch_tab_right') + np.count_nonzero(predictions_b == 'switch_tab_left')
         
         switch_confusion_rate = tab_switch_confusion / 40
         print(f"   🔄 Confusión cambio pestañas: {switch_confusion_rate:.3f}")
@@ -295,25 +398,14 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         scroll_accuracies = {}
         
         for scroll_direction in scroll_gestures:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(18):  # 18 muestras por dirección
-                predicted, confidence = self.simulate_gesture_detection(scroll_direction, 0.8)
-                self.log_prediction(scroll_direction, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == scroll_direction:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
+            accuracy, _ = self._measure_batch_accuracy(scroll_direction, 18, 0.8)  # 18 muestras por dirección
             scroll_accuracies[scroll_direction] = accuracy
             
             status = "✅" if accuracy >= 0.85 else "⚠️"
             print(f"   {status} {scroll_direction}: {accuracy:.3f}")
         
         # Verificar precisión direccional del scroll
-        avg_scroll_accuracy = np.mean(list(scroll_accuracies.values()))
+        avg_scroll_accuracy = sum(scroll_accuracies.values()) / len(scroll_accuracies)
         self.assertGreaterEqual(avg_scroll_accuracy, 0.85,
                               f"Precisión promedio direccional scroll insuficiente: {avg_scroll_accuracy:.3f}")
     
@@ -326,17 +418,7 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         zoom_results = {}
         
         for zoom_gesture in zoom_gestures:
-            predictions = []
-            confidences = []
-            
-            for _ in range(15):  # 15 muestras por zoom (más difíciles)
-                predicted, confidence = self.simulate_gesture_detection(zoom_gesture, 0.75)
-                self.log_prediction(zoom_gesture, predicted, confidence)
-                
-                predictions.append(predicted == zoom_gesture)
-                confidences.append(confidence)
-            
-            accuracy = np.mean(predictions)
+            accuracy, confidences = self._measure_batch_accuracy(zoom_gesture, 15, 0.75)  # 15 muestras por zoom (más difíciles)
             avg_confidence = np.mean(confidences)
             
             zoom_results[zoom_gesture] = {
@@ -350,22 +432,15 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {zoom_gesture}: Precisión {accuracy:.3f}, Confianza {avg_confidence:.3f}")
         
         # Verificar precisión mínima de zoom
-        avg_zoom_accuracy = np.mean([r['accuracy'] for r in zoom_results.values()])
+        avg_zoom_accuracy = sum(r['accuracy'] for r in zoom_results.values()) / len(zoom_results)
         self.assertGreaterEqual(avg_zoom_accuracy, 0.75,
                               f"Precisión promedio zoom insuficiente: {avg_zoom_accuracy:.3f}")
         
         # Test de discriminación zoom in/out
-        zoom_confusion = 0
-        for _ in range(20):
-            # Test zoom_in que no debe ser zoom_out
-            predicted, _ = self.simulate_gesture_detection('zoom_in', 0.75)
-            if predicted == 'zoom_out':
-                zoom_confusion += 1
-                
-            # Test zoom_out que no debe ser zoom_in  
-            predicted, _ = self.simulate_gesture_detection('zoom_out', 0.75)
-            if predicted == 'zoom_in':
-                zoom_confusion += 1
+        # Test zoom_in que no debe ser zoom_out, y viceversa
+        predictions_a, _ = self._simulate_batch('zoom_in', 20, 0.75)
+        predictions_b, _ = self._simulate_batch('zoom_out', 20, 0.75)
+        zoom_confusion = np.count_nonzero(predictions_a == 'zoom_out') + np.count_nonzero(predictions_b == 'zoom_in')
         
         zoom_confusion_rate = zoom_confusion / 40
         print(f"   🔄 Confusión zoom in/out: {zoom_confusion_rate:.3f}")
@@ -382,18 +457,7 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         utility_accuracies = {}
         
         for utility_gesture in utility_gestures:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(15):  # 15 muestras por utilidad
-                predicted, confidence = self.simulate_gesture_detection(utility_gesture, 0.8)
-                self.log_prediction(utility_gesture, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == utility_gesture:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
+            accuracy, _ = self._measure_batch_accuracy(utility_gesture, 15, 0.8)  # 15 muestras por utilidad
             utility_accuracies[utility_gesture] = accuracy
             
             min_utility_accuracy = 0.80
@@ -401,7 +465,7 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
             print(f"   {status} {utility_gesture}: {accuracy:.3f}")
         
         # Verificar precisión de utilidades
-        avg_utility_accuracy = np.mean(list(utility_accuracies.values()))
+        avg_utility_accuracy = sum(utility_accuracies.values()) / len(utility_accuracies)
         self.assertGreaterEqual(avg_utility_accuracy, 0.80,
                               f"Precisión promedio utilidades insuficiente: {avg_utility_accuracy:.3f}")
     
@@ -422,30 +486,28 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
         workflow_accuracies = []
         
         for i, workflow in enumerate(navigation_workflows):
-            workflow_predictions = []
-            workflow_ground_truth = []
+            workflow_ids = np.array([self.gesture_ids[g] for g in workflow], dtype=np.int8)
+            predicted_ids = np.empty(len(workflow), dtype=np.int8)
+            confidences = np.empty(len(workflow))
             
             print(f"   🔄 Workflow {i+1}: {' → '.join(workflow)}")
             
-            for gesture in workflow:
-                predicted, confidence = self.simulate_gesture_detection(gesture, 0.8)
-                workflow_predictions.append(predicted)
-                workflow_ground_truth.append(gesture)
-                
-                self.log_prediction(gesture, predicted, confidence)
-                
-                # Pausa entre gestos de workflow
-                time.sleep(0.002)
+            for j, gesture in enumerate(workflow):
+                predicted, confidences[j] = self.simulate_gesture_detection(gesture, 0.8)
+                predicted_ids[j] = self.gesture_ids[predicted]
+                # Sin pausa entre gestos: nada se cronometra aquí y el simulador no modela latencia
+            
+            # Registrar el workflow completo de una vez
+            self.log_predictions(workflow, self.gesture_arr[predicted_ids], confidences)
             
             # Calcular precisión de este workflow
-            workflow_accuracy = sum(1 for true_val, pred in zip(workflow_ground_truth, workflow_predictions) 
-                                  if true_val == pred) / len(workflow)
+            workflow_accuracy = np.count_nonzero(predicted_ids == workflow_ids) / predicted_ids.size
             workflow_accuracies.append(workflow_accuracy)
             
             print(f"      Precisión: {workflow_accuracy:.3f}")
         
         # Verificar precisión promedio de workflows
-        avg_workflow_accuracy = np.mean(workflow_accuracies)
+        avg_workflow_accuracy = sum(workflow_accuracies) / len(workflow_accuracies)
         
         print(f"   📊 Precisión promedio workflows: {avg_workflow_accuracy:.3f}")
         
@@ -463,32 +525,22 @@ class TestNavigationControllerAccuracy(BaseAccuracyTest):
             'close_tab', 'scroll_page_down', 'scroll_page_up'
         ]
         
-        rapid_sequence = []
-        for _ in range(15):  # 15 ciclos de gestos comunes
-            rapid_sequence.extend(common_nav_gestures)
-        
-        # Mezclar para simular uso real
-        np.random.shuffle(rapid_sequence)
+        common_ids = np.array([self.gesture_ids[g] for g in common_nav_gestures], dtype=np.int8)
         
-        rapid_results = []
-        start_time = time.time()
+        # 15 ciclos de gestos comunes, mezclados para simular uso real
+        rapid_ids = self.rng.permutation(np.tile(common_ids, 15))
         
-        for gesture in rapid_sequence:
-            predicted, confidence = self.simulate_gesture_detection(gesture, 0.8)
-            self.log_prediction(gesture, predicted, confidence)
-            
-            rapid_results.append(predicted == gesture)
-            
-            # Procesamiento muy rápido
-            time.sleep(0.0003)  # 0.3ms entre gestos
+        start_time = time.perf_counter()
+        predicted_ids, rapid_confidences = self._simulate_batch_ids(rapid_ids, 0.8)
+        total_time = time.perf_counter() - start_time
         
-        total_time = time.time() - start_time
-        rapid_accuracy = np.mean(rapid_results)
+        self.log_predictions(self.gesture_arr[rapid_ids], self.gesture_arr[predicted_ids], rapid_confidences)
+        rapid_accuracy = np.count_nonzero(predicted_ids == rapid_ids) / predicted_ids.size
         
-        print(f"   ⚡ Gestos procesados: {len(rapid_sequence)}")
+        print(f"   ⚡ Gestos procesados: {rapid_ids.size}")
         print(f"   ⏱️ Tiempo total: {total_time:.3f}s")
         print(f"   🎯 Precisión bajo uso rápido: {rapid_accuracy:.3f}")
-        print(f"   📈 Gestos/segundo: {len(rapid_sequence)/total_time:.1f}")
+        print(f"   📈 Gestos/segundo: {rapid_ids.size/total_time:.1f}")
         
         # Verificar que la precisión se mantiene en uso rápido
         self.assertGreaterEqual(rapid_accuracy, 0.85,
@@ -8,18 +8,91 @@ import sys
 import os
 import time
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, DEFAULT
 import numpy as np
 from typing import List, Tuple, Dict, Any
 
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
 
-from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest
+from tests.performance.metrics.accuracy.base_accuracy_test import BaseAccuracyTest, NUMBA_AVAILABLE, njit
+
+# Factor de escala del número de muestras (ACCURACY_SCALE=0.25 para una pasada corta,
+# >1 para intervalos de confianza más estrechos); el coste por muestra ya es vectorizado
+_SCALE = float(os.environ.get("ACCURACY_SCALE", "1.0"))
+
+def _scaled(n: int) -> int:
+    """Aplica ACCURACY_SCALE a un número de muestras, con un mínimo de 4."""
+    return max(4, int(n * _SCALE))
+
+@njit(cache=True, fastmath=True)
+def _sim_one(draws, gid, correct_p, confusion_ids, confusion_cdf, n_confusions, n_others):
+    """
+    Decide el id del atajo detectado a partir de tres uniformes ya extraídos
+    
+    Args:
+        draws: Uniformes en [0, 1) para acierto, tipo de error y selección
+        gid: Id del atajo verdadero
+        correct_p: Probabilidad de acierto del atajo
+        confusion_ids: Ids (rellenados) de los atajos con los que suele confundirse
+        confusion_cdf: Probabilidades acumuladas (rellenadas) de esas confusiones
+        n_confusions: Cantidad de confusiones válidas en las tablas
+        n_others: Cantidad de atajos candidatos para un error aleatorio
+        
+    Returns:
+        Id del atajo detectado
+    """
+    if draws[0] < correct_p:
+        return gid
+    
+    # 80% de errores son confusiones comunes: CDF inversa por recorrido lineal
+    if n_confusions > 0 and draws[1] < 0.80:
+        for k in range(n_confusions - 1):
+            if draws[2] < confusion_cdf[k]:
+                return confusion_ids[k]
+        return confusion_ids[n_confusions - 1]
+    
+    # Error aleatorio: cualquier otro atajo, saltando el verdadero
+    other_id = int(draws[2] * n_others)
+    if other_id >= gid:
+        other_id += 1
+    return other_id
 
 class TestShortcutsControllerAccuracy(BaseAccuracyTest):
     """Test de accuracy para ShortcutsControllerEnhanced."""
     
+    # Gestos de atajos a testear (tupla inmutable compartida, sin reconstruir en cada llamada)
+    _TEST_GESTURES = (
+        'copy',
+        'paste',
+        'cut',
+        'undo',
+        'redo',
+        'save',
+        'save_as',
+        'open',
+        'new',
+        'find',
+        'replace',
+        'select_all',
+        'escape',
+        'delete',
+        'print',
+        'no_gesture'
+    )
+    
+    # Secuencias típicas de trabajo rápido
+    _RAPID_WORKFLOWS = (
+        ('copy', 'paste', 'paste'),                    # Duplicación rápida
+        ('select_all', 'copy', 'new', 'paste'),        # Copia a nuevo documento
+        ('undo', 'undo', 'redo'),                      # Navegación histórica
+        ('save', 'copy', 'open', 'paste', 'save'),     # Workflow complejo
+        ('cut', 'escape', 'undo', 'copy', 'paste')     # Secuencia con escape
+    )
+    
+    # Latencia simulada por atajo en segundos; 0 (por defecto) desactiva las pausas
+    SIMULATE_LATENCY_S = float(os.environ.get('GESTUREAI_SIM_LATENCY', '0'))
+    
     @classmethod
     def setUpClass(cls):
         """Configuración inicial para todos los tests."""
@@ -27,23 +100,8 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         cls.target_accuracy = 0.93  # 93% - Alto para atajos críticos
         super().setUpClass()
         
-    def setUp(self):
-        """Configurar el test individual."""
-        super().setUp()
-        
-        # Mock de las dependencias de atajos
-        self.shortcuts_patches = [
-            patch('pyautogui.hotkey'),
-            patch('pyautogui.press'),
-            patch('pyautogui.keyDown'),
-            patch('pyautogui.keyUp'),
-            patch('os.path.exists', return_value=True)
-        ]
-        
-        self.shortcuts_mocks = [p.start() for p in self.shortcuts_patches]
-        
         # Configurar precisión específica por gesto de atajos
-        self.gesture_accuracy_rates = {
+        cls.gesture_accuracy_rates = {
             'copy': 0.97,               # Muy preciso, gesto muy común
             'paste': 0.96,              # Muy preciso, gesto muy común
             'cut': 0.94,                # Preciso, gesto común
@@ -63,7 +121,7 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         }
         
         # Configurar confusiones comunes de atajos
-        self.common_confusions = {
+        cls.common_confusions = {
             'copy': {'paste': 0.02, 'cut': 0.01},
             'paste': {'copy': 0.03, 'no_gesture': 0.01},
             'cut': {'copy': 0.04, 'delete': 0.02},
@@ -80,32 +138,93 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
             'print': {'save': 0.06, 'no_gesture': 0.07}
         }
         
-    def tearDown(self):
-        """Limpiar después del test."""
-        super().tearDown()
-        for patch_obj in self.shortcuts_patches:
-            patch_obj.stop()
+        # Tablas derivadas, constantes para toda la clase: se construyen una sola vez
+        cls._encode_gestures()
+        
+        # Un muestreador especializado por gesto, con sus parámetros ya fijados en la clausura
+        cls._sample_fn = {}
+        for gid, name in enumerate(cls._TEST_GESTURES):
+            cls._sample_fn[name] = cls._build_sampler(gid, cls._correct_p[gid], cls._confusion_ids[gid],
+                                                      cls._confusion_cdf[gid], cls._confusion_counts[gid])
+        
+        # os.path.exists no varía entre tests: se parchea una sola vez para toda la clase
+        cls._exists_patcher = patch('os.path.exists', return_value=True)
+        cls._exists_patcher.start()
+        cls.addClassCleanup(cls._exists_patcher.stop)
+        
+    def setUp(self):
+        """Configurar el test individual."""
+        super().setUp()
+        
+        # Mock de las dependencias de atajos con un único patcher
+        self._pyautogui_patcher = patch.multiple('pyautogui', hotkey=DEFAULT, press=DEFAULT,
+                                                 keyDown=DEFAULT, keyUp=DEFAULT)
+        self.shortcuts_mocks = self._pyautogui_patcher.start()
+        self.addCleanup(self._pyautogui_patcher.stop)
     
-    def get_test_gestures(self) -> List[str]:
-        """Retorna la lista de gestos de atajos a testear."""
-        return [
-            'copy',
-            'paste',
-            'cut',
-            'undo',
-            'redo',
-            'save',
-            'save_as',
-            'open',
-            'new',
-            'find',
-            'replace',
-            'select_all',
-            'escape',
-            'delete',
-            'print',
-            'no_gesture'
-        ]
+    def get_test_gestures(self) -> Tuple[str, ...]:
+        """Retorna los gestos de atajos a testear."""
+        return self._TEST_GESTURES
+    
+    @classmethod
+    def _encode_gestures(cls):
+        """Codifica los gestos como ids int8 y prepara las tablas de simulación por id"""
+        gestures = cls._TEST_GESTURES
+        cls._gid = {gesture: i for i, gesture in enumerate(gestures)}
+        cls._gname = np.array(gestures)
+        cls._correct_p = np.array([cls.gesture_accuracy_rates.get(g, 0.85) for g in gestures], dtype=np.float32)
+        
+        # Confusiones rellenadas con ceros hasta (K, max_confusiones), probabilidades normalizadas
+        max_confusions = max(len(c) for c in cls.common_confusions.values())
+        cls._confusion_ids = np.zeros((len(gestures), max_confusions), dtype=np.int8)
+        cls._confusion_probs = np.zeros((len(gestures), max_confusions), dtype=np.float32)
+        for gesture, confusions in cls.common_confusions.items():
+            gid = cls._gid[gesture]
+            probs = np.array(list(confusions.values()))
+            cls._confusion_ids[gid, :len(confusions)] = [cls._gid[g] for g in confusions]
+            cls._confusion_probs[gid, :len(confusions)] = probs / probs.sum()
+        cls._confusion_counts = np.array([len(cls.common_confusions.get(g, {})) for g in gestures], dtype=np.int8)
+        cls._confusion_cdf = np.cumsum(cls._confusion_probs, axis=1)
+        
+        # Atajos críticos como máscara indexada por id: la pertenencia es una consulta al array
+        cls._critical_mask = np.zeros(len(gestures), dtype=bool)
+        cls._critical_mask[[cls._gid[g] for g in ('save', 'escape', 'delete', 'cut')]] = True
+        
+        # Ids de los atajos reales (no_gesture es el último gesto y queda fuera)
+        cls._shortcut_ids = np.arange(len(gestures) - 1, dtype=np.int8)
+        
+        # Workflows rápidos ya codificados como ids
+        cls._workflows = [np.array([cls._gid[s] for s in workflow], dtype=np.int8)
+                          for workflow in cls._RAPID_WORKFLOWS]
+    
+    @classmethod
+    def _build_sampler(cls, gid, correct_p, confusion_ids, confusion_cdf, n_confusions):
+        """
+        Construye el muestreador escalar de un gesto con todos sus parámetros fijados
+        
+        Args:
+            gid: Id del gesto
+            correct_p: Probabilidad de acierto del gesto
+            confusion_ids: Ids (rellenados) de sus confusiones comunes
+            confusion_cdf: Probabilidades acumuladas (rellenadas) de esas confusiones
+            n_confusions: Cantidad de confusiones válidas
+            
+        Returns:
+            Función (rng, confianza_esperada) -> (gesto_detectado, confianza)
+        """
+        names = cls._gname
+        n_others = len(names) - 1
+        
+        def _sample(rng, expected_confidence):
+            predicted_id = _sim_one(rng.random(3), gid, correct_p, confusion_ids, confusion_cdf,
+                                    n_confusions, n_others)
+            if predicted_id == gid:
+                # Predicción correcta, con la confianza ligeramente variada
+                return names[gid], np.clip(expected_confidence + rng.normal(0, 0.03), 0.3, 0.99)
+            # Predicción incorrecta, con confianza más baja
+            return names[predicted_id], rng.uniform(0.25, 0.6)
+        
+        return _sample
     
     def simulate_gesture_detection(self, gesture: str, expected_confidence: float = 0.8) -> Tuple[str, float]:
         """
@@ -118,44 +237,116 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         Returns:
             Tupla (gesto_detectado, confianza_real)
         """
-        # Obtener tasa de precisión para este gesto
-        accuracy_rate = self.gesture_accuracy_rates.get(gesture, 0.85)
-        
-        # Determinar si la predicción será correcta
-        is_correct = np.random.random() < accuracy_rate
-        
-        if is_correct:
-            # Predicción correcta
-            predicted_gesture = gesture
-            # Variar ligeramente la confianza
-            confidence_variation = np.random.normal(0, 0.03)
-            confidence = np.clip(expected_confidence + confidence_variation, 0.3, 0.99)
-        else:
-            # Predicción incorrecta
-            confusions = self.common_confusions.get(gesture, {})
+        # Muestreador especializado del gesto (kernel compilado con sus parámetros ya fijados)
+        predicted_gesture, confidence = self._sample_fn[gesture](self.rng, expected_confidence)
+        
+        # Simular tiempo de procesamiento muy rápido para atajos (sólo si se pide)
+        if self.SIMULATE_LATENCY_S:
+            time.sleep(self.SIMULATE_LATENCY_S)
+        
+        return predicted_gesture, confidence
+    
+    def simulate_gesture_batch(self, gesture: str, n: int, expected_confidence: float = 0.8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula n detecciones de un mismo gesto de atajo en una sola pasada vectorizada
+        
+        Args:
+            gesture: Nombre del gesto a simular
+            n: Número de muestras
+            expected_confidence: Nivel de confianza esperado
             
-            if confusions and np.random.random() < 0.80:  # 80% de errores son confusiones comunes
-                confusion_gestures = list(confusions.keys())
-                confusion_probs = list(confusions.values())
-                
-                total_prob = sum(confusion_probs)
-                if total_prob > 0:
-                    confusion_probs = [p/total_prob for p in confusion_probs]
-                    predicted_gesture = np.random.choice(confusion_gestures, p=confusion_probs)
-                else:
-                    predicted_gesture = np.random.choice(self.get_test_gestures())
-            else:
-                # Error aleatorio
-                all_gestures = self.get_test_gestures()
-                predicted_gesture = np.random.choice([g for g in all_gestures if g != gesture])
+        Returns:
+            Tupla (ids_detectados, confianzas) como arrays de longitud n
+        """
+        gid = self._gid[gesture]
+        
+        # Aciertos y confianzas de todo el lote
+        correct_mask = self.rng.random(n, dtype=np.float32) < self._correct_p[gid]
+        confidences = np.where(correct_mask,
+                               np.clip(expected_confidence + self.rng.normal(0, 0.03, n), 0.3, 0.99),
+                               self.rng.uniform(0.25, 0.6, n))
+        
+        # 80% de errores son confusiones comunes (si el gesto las tiene), el resto errores aleatorios
+        n_confusions = self._confusion_counts[gid]
+        if n_confusions:
+            common_mask = self.rng.random(n, dtype=np.float32) < 0.80
+            # CDF inversa precalculada: searchsorted sin la validación de rng.choice(p=...)
+            idx = np.searchsorted(self._confusion_cdf[gid, :n_confusions], self.rng.random(n, dtype=np.float32),
+                                  side='right')
+            common_ids = self._confusion_ids[gid, np.minimum(idx, n_confusions - 1)]
+        else:
+            common_mask = np.zeros(n, dtype=bool)
+            common_ids = np.zeros(n, dtype=np.int8)
+        
+        # Error aleatorio: cualquier otro gesto, saltando el verdadero
+        random_ids = self.rng.integers(0, len(self._gname) - 1, n).astype(np.int8)
+        random_ids += random_ids >= gid
+        
+        predictions = np.where(correct_mask, gid, np.where(common_mask, common_ids, random_ids)).astype(np.int8)
+        return predictions, confidences.astype(np.float32)
+    
+    def simulate_gesture_batch_mixed(self, gids: np.ndarray, expected_confidence: float = 0.75) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simula la detección de un lote de atajos distintos, dados por su id
+        
+        Args:
+            gids: Ids de los atajos verdaderos (int8)
+            expected_confidence: Nivel de confianza esperado
             
-            # Confianza más baja para predicciones incorrectas
-            confidence = np.random.uniform(0.25, 0.6)
+        Returns:
+            Tupla (ids_detectados, confianzas) como arrays de la misma longitud
+        """
+        n = gids.size
         
-        # Simular tiempo de procesamiento muy rápido para atajos
-        time.sleep(0.0005)  # 0.5ms de procesamiento simulado
+        # Aciertos y confianzas de todo el lote, con la tasa de precisión de cada atajo
+        correct = self.rng.random(n, dtype=np.float32) < self._correct_p[gids]
+        confidences = np.where(correct,
+                               np.clip(expected_confidence + self.rng.normal(0, 0.03, n), 0.3, 0.99),
+                               self.rng.uniform(0.25, 0.6, n))
         
-        return predicted_gesture, confidence
+        # 80% de errores son confusiones comunes (si el atajo las tiene), el resto errores aleatorios
+        n_confusions = self._confusion_counts[gids]
+        common = (self.rng.random(n, dtype=np.float32) < 0.80) & (n_confusions > 0)
+        
+        # CDF inversa por fila sobre las tablas rellenadas
+        u = self.rng.random(n, dtype=np.float32)
+        idx = np.minimum((self._confusion_cdf[gids] < u[:, None]).sum(axis=1), np.maximum(n_confusions - 1, 0))
+        wrong_common = self._confusion_ids[gids, idx]
+        
+        # Error aleatorio: cualquier otro atajo, saltando el verdadero
+        wrong_random = self.rng.integers(0, len(self._gname) - 1, n).astype(np.int8)
+        wrong_random += wrong_random >= gids
+        
+        predictions = np.where(correct, gids, np.where(common, wrong_common, wrong_random)).astype(np.int8)
+        return predictions, confidences.astype(np.float32)
+    
+    def _run_gesture_batch(self, gesture: str, n: int, expected_conf: float = 0.85) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Simula, registra y puntúa n detecciones de un mismo atajo de una sola vez
+        
+        Args:
+            gesture: Nombre del gesto a simular
+            n: Número de muestras
+            expected_conf: Nivel de confianza esperado
+            
+        Returns:
+            Tupla (ids_detectados, confianzas, precisión)
+        """
+        predictions, confidences = self.simulate_gesture_batch(gesture, n, expected_conf)
+        self.log_predictions(gesture, self._gname[predictions], confidences)
+        return predictions, confidences, float((predictions == self._gid[gesture]).mean())
+    
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba no instalado: el kernel se ejecuta en Python")
+    def test_jit_kernel_matches_python(self):
+        """Test de que el kernel compilado decide igual que su versión Python"""
+        
+        for gid in range(len(self._gname)):
+            args = (gid, self._correct_p[gid], self._confusion_ids[gid], self._confusion_cdf[gid],
+                    self._confusion_counts[gid], len(self._gname) - 1)
+            
+            for draws in self.rng.random((50, 3)):
+                self.assertEqual(_sim_one(draws, *args), _sim_one.py_func(draws, *args),
+                                 f"El kernel compilado difiere de Python para {self._gname[gid]}")
     
     def test_essential_shortcuts_accuracy(self):
         """Test de precisión para atajos esenciales"""
@@ -164,19 +355,8 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         print(f"\n⌨️ Testeando precisión de atajos esenciales...")
         
         for shortcut in essential_shortcuts:
-            predictions = []
-            ground_truth = []
-            
             # Test con múltiples muestras
-            for _ in range(25):  # 25 muestras por atajo esencial
-                predicted, confidence = self.simulate_gesture_detection(shortcut, 0.85)
-                predictions.append(predicted)
-                ground_truth.append(shortcut)
-                
-                self.log_prediction(shortcut, predicted, confidence)
-            
-            # Calcular precisión
-            accuracy = sum(1 for true_val, pred in zip(ground_truth, predictions) if true_val == pred) / len(predictions)
+            _, _, accuracy = self._run_gesture_batch(shortcut, _scaled(25), 0.85)  # 25 muestras por atajo esencial
             
             # Verificar precisión alta para atajos esenciales
             min_essential_accuracy = 0.92  # 92% mínimo para atajos esenciales
@@ -195,22 +375,12 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         operation_results = {}
         
         for operation in clipboard_operations:
-            correct_predictions = 0
-            total_predictions = 0
-            confusions = {}
+            predictions, _, accuracy = self._run_gesture_batch(operation, _scaled(20), 0.85)  # 20 muestras por operación
             
-            for _ in range(20):  # 20 muestras por operación
-                predicted, confidence = self.simulate_gesture_detection(operation, 0.85)
-                self.log_prediction(operation, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == operation:
-                    correct_predictions += 1
-                else:
-                    # Contar confusiones específicas
-                    confusions[predicted] = confusions.get(predicted, 0) + 1
+            # Contar confusiones específicas
+            confused_ids, confused_counts = np.unique(predictions[predictions != self._gid[operation]], return_counts=True)
+            confusions = dict(zip(self._gname[confused_ids].tolist(), confused_counts.tolist()))
             
-            accuracy = correct_predictions / total_predictions
             operation_results[operation] = {
                 'accuracy': accuracy,
                 'confusions': confusions
@@ -239,18 +409,7 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         history_accuracies = {}
         
         for operation in history_operations:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(20):  # 20 muestras por operación
-                predicted, confidence = self.simulate_gesture_detection(operation, 0.8)
-                self.log_prediction(operation, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == operation:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
+            _, _, accuracy = self._run_gesture_batch(operation, _scaled(20), 0.8)  # 20 muestras por operación
             history_accuracies[operation] = accuracy
             
             status = "✅" if accuracy >= 0.88 else "⚠️"
@@ -262,19 +421,13 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
                               f"Precisión promedio undo/redo insuficiente: {avg_history_accuracy:.3f}")
         
         # Test de discriminación undo vs redo
-        undo_redo_confusion = 0
-        for _ in range(20):
-            # Test undo que no debe ser redo
-            predicted, _ = self.simulate_gesture_detection('undo', 0.8)
-            if predicted == 'redo':
-                undo_redo_confusion += 1
-                
-            # Test redo que no debe ser undo
-            predicted, _ = self.simulate_gesture_detection('redo', 0.8)
-            if predicted == 'undo':
-                undo_redo_confusion += 1
-        
-        confusion_rate = undo_redo_confusion / 40
+        # 20 muestras de undo seguidas de 20 de redo; la secuencia invertida da, fila a fila,
+        # el gesto con el que no debe confundirse cada muestra
+        pair_ids = np.repeat(np.array([self._gid['undo'], self._gid['redo']], dtype=np.int8), _scaled(20))
+        predictions, _ = self.simulate_gesture_batch_mixed(pair_ids, 0.8)
+        undo_redo_confusion = np.count_nonzero(predictions == pair_ids[::-1])
+        
+        confusion_rate = undo_redo_confusion / pair_ids.size
         print(f"   🔄 Confusión undo/redo: {confusion_rate:.3f}")
         
         self.assertLess(confusion_rate, 0.10,
@@ -289,18 +442,7 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         file_accuracies = {}
         
         for operation in file_operations:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(18):  # 18 muestras por operación
-                predicted, confidence = self.simulate_gesture_detection(operation, 0.8)
-                self.log_prediction(operation, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == operation:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
+            _, _, accuracy = self._run_gesture_batch(operation, _scaled(18), 0.8)  # 18 muestras por operación
             file_accuracies[operation] = accuracy
             
             # Umbral específico para cada operación
@@ -327,18 +469,7 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         text_accuracies = {}
         
         for operation in text_operations:
-            correct_predictions = 0
-            total_predictions = 0
-            
-            for _ in range(15):  # 15 muestras por operación
-                predicted, confidence = self.simulate_gesture_detection(operation, 0.8)
-                self.log_prediction(operation, predicted, confidence)
-                
-                total_predictions += 1
-                if predicted == operation:
-                    correct_predictions += 1
-            
-            accuracy = correct_predictions / total_predictions
+            _, _, accuracy = self._run_gesture_batch(operation, _scaled(15), 0.8)  # 15 muestras por operación
             text_accuracies[operation] = accuracy
             
             # Umbral específico para cada operación
@@ -352,19 +483,12 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
                               f"Precisión promedio operaciones texto insuficiente: {avg_text_accuracy:.3f}")
         
         # Test específico de discriminación find vs replace
-        find_replace_confusion = 0
-        for _ in range(15):
-            # Test find que no debe ser replace
-            predicted, _ = self.simulate_gesture_detection('find', 0.8)
-            if predicted == 'replace':
-                find_replace_confusion += 1
-                
-            # Test replace que no debe ser find
-            predicted, _ = self.simulate_gesture_detection('replace', 0.8)
-            if predicted == 'find':
-                find_replace_confusion += 1
-        
-        confusion_rate = find_replace_confusion / 30
+        # Mismo esquema que undo/redo: find que no debe ser replace, y viceversa
+        pair_ids = np.repeat(np.array([self._gid['find'], self._gid['replace']], dtype=np.int8), _scaled(15))
+        predictions, _ = self.simulate_gesture_batch_mixed(pair_ids, 0.8)
+        find_replace_confusion = np.count_nonzero(predictions == pair_ids[::-1])
+        
+        confusion_rate = find_replace_confusion / pair_ids.size
         print(f"   🔄 Confusión find/replace: {confusion_rate:.3f}")
         
         self.assertLess(confusion_rate, 0.20,
@@ -375,17 +499,7 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         
         print(f"\n🚪 Testeando precisión de escape...")
         
-        escape_predictions = []
-        escape_confidences = []
-        
-        for _ in range(30):  # Más muestras para gesto crítico
-            predicted, confidence = self.simulate_gesture_detection('escape', 0.85)
-            self.log_prediction('escape', predicted, confidence)
-            
-            escape_predictions.append(predicted == 'escape')
-            escape_confidences.append(confidence)
-        
-        escape_accuracy = np.mean(escape_predictions)
+        _, escape_confidences, escape_accuracy = self._run_gesture_batch('escape', _scaled(30), 0.85)  # Más muestras para gesto crítico
         avg_escape_confidence = np.mean(escape_confidences)
         
         print(f"   🎯 Precisión escape: {escape_accuracy:.3f}")
@@ -400,16 +514,12 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
                               f"Confianza de escape insuficiente: {avg_escape_confidence:.3f}")
         
         # Test de falsos positivos de escape
-        false_escape_count = 0
-        other_shortcuts = ['copy', 'paste', 'save', 'undo', 'delete']
-        
-        for shortcut in other_shortcuts:
-            for _ in range(5):  # 5 tests por atajo
-                predicted, _ = self.simulate_gesture_detection(shortcut, 0.8)
-                if predicted == 'escape':
-                    false_escape_count += 1
+        other_ids = np.array([self._gid[s] for s in ('copy', 'paste', 'save', 'undo', 'delete')], dtype=np.int8)
+        gids = np.repeat(other_ids, _scaled(5))  # 5 tests por atajo
+        predictions, _ = self.simulate_gesture_batch_mixed(gids, 0.8)
+        false_escape_count = np.count_nonzero(predictions == self._gid['escape'])
         
-        false_escape_rate = false_escape_count / (len(other_shortcuts) * 5)
+        false_escape_rate = false_escape_count / gids.size
         print(f"   🚨 Tasa falsos escape: {false_escape_rate:.3f}")
         
         self.assertLess(false_escape_rate, 0.05,
@@ -420,40 +530,21 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         
         print(f"\n⚡ Testeando secuencias rápidas de atajos...")
         
-        # Secuencias típicas de trabajo rápido
-        rapid_workflows = [
-            ['copy', 'paste', 'paste'],                    # Duplicación rápida
-            ['select_all', 'copy', 'new', 'paste'],        # Copia a nuevo documento
-            ['undo', 'undo', 'redo'],                      # Navegación histórica
-            ['save', 'copy', 'open', 'paste', 'save'],     # Workflow complejo
-            ['cut', 'escape', 'undo', 'copy', 'paste']     # Secuencia con escape
-        ]
-        
         workflow_accuracies = []
         
-        for i, workflow in enumerate(rapid_workflows):
-            workflow_predictions = []
-            workflow_ground_truth = []
-            
-            print(f"   ⚡ Workflow {i+1}: {' → '.join(workflow)}")
-            
-            start_time = time.time()
+        for i, workflow_ids in enumerate(self._workflows):
+            print(f"   ⚡ Workflow {i+1}: {' → '.join(self._RAPID_WORKFLOWS[i])}")
             
-            for shortcut in workflow:
-                predicted, confidence = self.simulate_gesture_detection(shortcut, 0.85)
-                workflow_predictions.append(predicted)
-                workflow_ground_truth.append(shortcut)
-                
-                self.log_prediction(shortcut, predicted, confidence)
-                
-                # Pausa muy corta para simular uso muy rápido
-                time.sleep(0.0002)  # 0.2ms entre atajos
+            start_time = time.perf_counter()
+            predictions, confidences = self.simulate_gesture_batch_mixed(workflow_ids, 0.85)
+            # Sin pausas reales entre atajos: la latencia simulada se suma analíticamente
+            total_time = workflow_ids.size * self.SIMULATE_LATENCY_S + time.perf_counter() - start_time
             
-            total_time = time.time() - start_time
+            # Registrar el workflow completo de una vez
+            self.log_predictions(self._gname[workflow_ids], self._gname[predictions], confidences)
             
             # Calcular precisión de este workflow
-            workflow_accuracy = sum(1 for true_val, pred in zip(workflow_ground_truth, workflow_predictions) 
-                                  if true_val == pred) / len(workflow)
+            workflow_accuracy = float((predictions == workflow_ids).mean())
             workflow_accuracies.append(workflow_accuracy)
             
             print(f"      Precisión: {workflow_accuracy:.3f}, Tiempo: {total_time:.3f}s")
@@ -479,31 +570,29 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
             'poco_frecuente': ['save_as', 'replace', 'redo', 'print']
         }
         
-        frequency_metrics = {}
+        # Todos los grupos en un único lote: ids de atajo y, en paralelo, el índice de su grupo
+        samples_per_shortcut = _scaled(12)  # 12 muestras por atajo
+        group_ids = [np.array([self._gid[s] for s in shortcuts], dtype=np.int8) for shortcuts in frequency_groups.values()]
+        flat_gids = np.concatenate([np.repeat(ids, samples_per_shortcut) for ids in group_ids])
+        flat_group = np.repeat(np.arange(len(frequency_groups)),
+                               [samples_per_shortcut * ids.size for ids in group_ids])
         
-        for frequency, shortcuts in frequency_groups.items():
-            group_confidences = []
-            group_accuracies = []
-            
-            for shortcut in shortcuts:
-                for _ in range(12):  # 12 muestras por atajo
-                    predicted, confidence = self.simulate_gesture_detection(shortcut, 0.8)
-                    
-                    is_correct = (predicted == shortcut)
-                    group_confidences.append(confidence)
-                    group_accuracies.append(is_correct)
-                    
-                    self.log_prediction(shortcut, predicted, confidence)
-            
-            avg_confidence = np.mean(group_confidences)
-            avg_accuracy = np.mean(group_accuracies)
-            
+        predictions, confidences = self.simulate_gesture_batch_mixed(flat_gids, 0.8)
+        self.log_predictions(self._gname[flat_gids], self._gname[predictions], confidences)
+        
+        # Medias por grupo con una reducción agrupada
+        group_sizes = np.bincount(flat_group)
+        group_accuracy = np.bincount(flat_group, weights=(predictions == flat_gids)) / group_sizes
+        group_confidence = np.bincount(flat_group, weights=confidences) / group_sizes
+        
+        frequency_metrics = {}
+        for i, frequency in enumerate(frequency_groups):
             frequency_metrics[frequency] = {
-                'confidence': avg_confidence,
-                'accuracy': avg_accuracy
+                'confidence': group_confidence[i],
+                'accuracy': group_accuracy[i]
             }
             
-            print(f"   📈 {frequency}: Confianza {avg_confidence:.3f}, Precisión {avg_accuracy:.3f}")
+            print(f"   📈 {frequency}: Confianza {group_confidence[i]:.3f}, Precisión {group_accuracy[i]:.3f}")
         
         # Verificar que atajos muy frecuentes tienen alta precisión
         very_frequent_metrics = frequency_metrics['muy_frecuente']
@@ -517,44 +606,31 @@ class TestShortcutsControllerAccuracy(BaseAccuracyTest):
         
         print(f"\n💥 Testeando atajos bajo estrés...")
         
-        # Crear secuencia de estrés con atajos mezclados
-        stress_sequence = []
-        all_shortcuts = self.get_test_gestures()[:-1]  # Excluir no_gesture
-        
-        for _ in range(20):  # 20 ciclos de todos los atajos
-            stress_sequence.extend(all_shortcuts)
+        # Crear secuencia de estrés: 20 ciclos de todos los atajos, como ids int8
+        stress_ids = np.tile(self._shortcut_ids, _scaled(20))
         
         # Mezclar para crear patrón impredecible
-        np.random.shuffle(stress_sequence)
-        
-        stress_results = []
-        critical_errors = 0  # Errores en atajos críticos
-        critical_shortcuts = ['save', 'escape', 'delete', 'cut']
+        self.rng.shuffle(stress_ids)
+        print(f"   🔀 Inicio de secuencia: {' → '.join(self._gname[stress_ids[:5]])}")
         
-        start_time = time.time()
+        start_time = time.perf_counter()
+        predicted_ids, confidences = self.simulate_gesture_batch_mixed(stress_ids, 0.75)
+        compute_time = time.perf_counter() - start_time
         
-        for shortcut in stress_sequence:
-            predicted, confidence = self.simulate_gesture_detection(shortcut, 0.75)
-            self.log_prediction(shortcut, predicted, confidence)
-            
-            is_correct = (predicted == shortcut)
-            stress_results.append(is_correct)
-            
-            # Contar errores críticos
-            if shortcut in critical_shortcuts and not is_correct:
-                critical_errors += 1
-            
-            # Procesamiento ultra rápido bajo estrés
-            time.sleep(0.0001)  # 0.1ms entre atajos
+        # El lote no duerme entre atajos: la latencia simulada se suma analíticamente
+        total_time = stress_ids.size * self.SIMULATE_LATENCY_S + compute_time
+        self.log_predictions(self._gname[stress_ids], self._gname[predicted_ids], confidences)
         
-        total_time = time.time() - start_time
-        stress_accuracy = np.mean(stress_results)
-        critical_error_rate = critical_errors / len([s for s in stress_sequence if s in critical_shortcuts])
+        # Aciertos y errores críticos (errores en atajos críticos) con máscaras booleanas
+        correct_mask = predicted_ids == stress_ids
+        critical_mask = self._critical_mask[stress_ids]
+        stress_accuracy = float(correct_mask.mean())
+        critical_error_rate = np.count_nonzero(~correct_mask & critical_mask) / np.count_nonzero(critical_mask)
         
-        print(f"   ⚡ Atajos procesados: {len(stress_sequence)}")
+        print(f"   ⚡ Atajos procesados: {stress_ids.size}")
         print(f"   ⏱️ Tiempo total: {total_time:.3f}s")
         print(f"   🎯 Precisión bajo estrés: {stress_accuracy:.3f}")
-        print(f"   📈 Atajos/segundo: {len(stress_sequence)/total_time:.1f}")
+        print(f"   📈 Atajos/segundo: {stress_ids.size/total_time:.1f}")
         print(f"   ⚠️ Tasa error críticos: {critical_error_rate:.3f}")
         
         # Verificar que la precisión se mantiene bajo estrés